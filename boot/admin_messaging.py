@@ -1,14 +1,39 @@
-import sqlite3
+import asyncio
+import datetime
 import logging
-from config import DB_PATH, ADMIN_IDS
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from config import ADMIN_IDS
+from db_connection import get_sqlite_pool
 from utils import escape_markdown_text
 
 logger = logging.getLogger(__name__)
 
+# MarkdownV2-safe timestamp format ('-' is pre-escaped, so no escape pass is needed)
+ADMIN_TIMESTAMP_FORMAT = '%Y\\-%m\\-%d %H:%M:%S'
+
+_UPDATE_MARK_READ = "UPDATE admin_messages SET replied = 1 WHERE message_id = ?"
+
+# Background fan-out of user messages to admins (see start_admin_broadcast_worker)
+_admin_broadcast_queue = None
+_admin_broadcast_task = None
+
+def _make_admin_keyboard(message_id, user_id):
+    """Build the inline action keyboard attached to a forwarded user message"""
+    return InlineKeyboardMarkup((
+        (
+            InlineKeyboardButton("💬 Quick Reply", callback_data=f"admin_reply_{message_id}"),
+            InlineKeyboardButton("📋 View History", callback_data=f"admin_history_{user_id}"),
+        ),
+        (
+            InlineKeyboardButton("✅ Mark as Read", callback_data=f"admin_read_{message_id}"),
+            InlineKeyboardButton("🔇 Ignore User", callback_data=f"admin_ignore_{user_id}"),
+        ),
+    ))
+
 def save_user_message(user_id, message):
     """Save user message to admin"""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO admin_messages (user_id, user_message) VALUES (?, ?)",
@@ -21,22 +46,25 @@ def save_user_message(user_id, message):
         return None, f"Database error: {str(e)}"
 
 def save_admin_reply(message_id, admin_id, reply):
-    """Save admin reply to user message"""
+    """Save admin reply to user message, returning (recipient user_id, error)"""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE admin_messages SET admin_reply = ?, admin_id = ?, replied = 1 WHERE message_id = ?",
+                "UPDATE admin_messages SET admin_reply = ?, admin_id = ?, replied = 1 WHERE message_id = ? RETURNING user_id",
                 (reply, admin_id, message_id)
             )
+            row = cursor.fetchone()
             conn.commit()
-            return True
+            if not row:
+                return None, "Message not found"
+            return row[0], None
     except Exception as e:
-        return False
+        return None, f"Database error: {str(e)}"
 
 def get_pending_messages():
     """Get all pending user messages for admins"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
             SELECT message_id, user_id, user_message, timestamp
@@ -48,7 +76,7 @@ def get_pending_messages():
 
 def get_message_by_id(message_id):
     """Get specific message by ID"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "SELECT * FROM admin_messages WHERE message_id = ?",
@@ -56,29 +84,16 @@ def get_message_by_id(message_id):
         )
         return cursor.fetchone()
 
-async def send_message_to_admins(context, user_id, message):
-    """Send user message to all admins with inline reply buttons"""
-    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-    
-    logger.info(f"Attempting to send message from user {user_id} to admins")
-    
-    message_id, error = save_user_message(user_id, message)
-    
-    if error:
-        logger.error(f"Error saving message: {error}")
-        return False, error
-    
-    logger.info(f"Message saved with ID: {message_id}")
-    
-    import datetime
-    current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+async def _broadcast_to_admins(bot, message_id, user_id, message):
+    """Send a saved user message to all admins with inline reply buttons"""
+    current_time = datetime.datetime.now().strftime(ADMIN_TIMESTAMP_FORMAT)
     
     admin_text = f"""
 📨 *New User Message*
 
 *Message ID:* \\#{message_id}
 *From User:* {user_id}
-*Timestamp:* {escape_markdown_text(current_time)}
+*Timestamp:* {current_time}
 
 *Message:*
 {escape_markdown_text(message)}
@@ -88,56 +103,83 @@ async def send_message_to_admins(context, user_id, message):
 • Or use: `/reply {message_id} <your_response>`
 """
     
-    # Create inline keyboard for admin actions
-    keyboard = [
-        [
-            InlineKeyboardButton("💬 Quick Reply", callback_data=f"admin_reply_{message_id}"),
-            InlineKeyboardButton("📋 View History", callback_data=f"admin_history_{user_id}")
-        ],
-        [
-            InlineKeyboardButton("✅ Mark as Read", callback_data=f"admin_read_{message_id}"),
-            InlineKeyboardButton("🔇 Ignore User", callback_data=f"admin_ignore_{user_id}")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    success_count = 0
-    
-    # Ensure there are admins in the list
-    if not ADMIN_IDS:
-        logger.warning("No admins configured!")
-        return False, "No admins configured"
+    reply_markup = _make_admin_keyboard(message_id, user_id)
     
     logger.info(f"Sending to {len(ADMIN_IDS)} admin(s)")
     
-    for admin_id in ADMIN_IDS:
+    async def _send_one(admin_id):
         try:
-            await context.bot.send_message(
+            await bot.send_message(
                 chat_id=admin_id,
                 text=admin_text,
                 reply_markup=reply_markup,
                 parse_mode="MarkdownV2"
             )
-            success_count += 1
             logger.info(f"Successfully sent to admin {admin_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to send to admin {admin_id}: {e}")
+            return False
+    
+    # Send to all admins concurrently rather than one round-trip at a time
+    results = await asyncio.gather(*(_send_one(admin_id) for admin_id in ADMIN_IDS))
+    success_count = sum(results)
     
-    logger.info(f"Total successful sends: {success_count}")
-    return success_count > 0, f"Sent to {success_count} admins"
+    logger.info(f"Total successful sends for message {message_id}: {success_count}")
+    return success_count
 
-async def send_admin_reply_to_user(context, message_id, admin_id, reply):
-    """Send admin reply to user anonymously"""
-    message_data = get_message_by_id(message_id)
+async def _admin_broadcast_worker():
+    """Consume queued user messages and fan them out to admins"""
+    while True:
+        bot, message_id, user_id, message = await _admin_broadcast_queue.get()
+        try:
+            if not await _broadcast_to_admins(bot, message_id, user_id, message):
+                # Still pending in admin_messages, so /messages will show it
+                logger.error(f"Message {message_id} was not delivered to any admin")
+        except Exception as e:
+            logger.error(f"Error broadcasting message {message_id} to admins: {e}")
+        finally:
+            _admin_broadcast_queue.task_done()
+
+def start_admin_broadcast_worker():
+    """Start the background admin broadcast worker on the running event loop"""
+    global _admin_broadcast_queue, _admin_broadcast_task
+    if _admin_broadcast_task is None or _admin_broadcast_task.done():
+        if _admin_broadcast_queue is None:
+            _admin_broadcast_queue = asyncio.Queue()
+        _admin_broadcast_task = asyncio.create_task(_admin_broadcast_worker())
+
+async def send_message_to_admins(context, user_id, message):
+    """Save a user message and queue it for admins (success means queued, not delivered)"""
+    logger.info(f"Attempting to send message from user {user_id} to admins")
     
-    if not message_data:
-        return False, "Message not found"
+    # Ensure there are admins in the list
+    if not ADMIN_IDS:
+        logger.warning("No admins configured!")
+        return False, "No admins configured"
+    
+    message_id, error = save_user_message(user_id, message)
+    
+    if error:
+        logger.error(f"Error saving message: {error}")
+        return False, error
     
-    user_id = message_data[1]  # user_id is at index 1
+    logger.info(f"Message saved with ID: {message_id}")
     
-    # Save the reply
-    if not save_admin_reply(message_id, admin_id, reply):
-        return False, "Failed to save reply"
+    # The Telegram fan-out happens in the background so the user is answered
+    # as soon as the message is stored
+    start_admin_broadcast_worker()
+    await _admin_broadcast_queue.put((context.bot, message_id, user_id, message))
+    
+    return True, f"Queued for {len(ADMIN_IDS)} admins"
+
+async def send_admin_reply_to_user(context, message_id, admin_id, reply):
+    """Send admin reply to user anonymously"""
+    # Save the reply; the UPDATE also tells us who sent the original message
+    user_id, error = save_admin_reply(message_id, admin_id, reply)
+    
+    if error:
+        return False, error
     
     # Send to user
     try:
@@ -157,25 +199,26 @@ If you need to respond, use "📞 Contact Admin" again\\.
     except Exception as e:
         return False, f"Failed to send reply: {str(e)}"
 
-def mark_message_as_read(message_id):
-    """Mark a message as read/handled"""
+def batch_mark_read(message_ids):
+    """Mark several messages as read/handled in one transaction; returns rows updated"""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE admin_messages SET replied = 1 WHERE message_id = ?",
-                (message_id,)
-            )
+            cursor.executemany(_UPDATE_MARK_READ, [(message_id,) for message_id in message_ids])
             conn.commit()
-            return cursor.rowcount > 0
+            return cursor.rowcount
     except Exception as e:
-        logger.error(f"Error marking message as read: {e}")
-        return False
+        logger.error(f"Error marking messages as read: {e}")
+        return 0
+
+def mark_message_as_read(message_id):
+    """Mark a message as read/handled"""
+    return batch_mark_read([message_id]) > 0
 
 def ignore_user_messages(user_id):
     """Mark all messages from a user as ignored/handled"""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE admin_messages SET replied = 1 WHERE user_id = ? AND replied = 0",
@@ -189,7 +232,7 @@ def ignore_user_messages(user_id):
 
 def get_user_message_history(user_id, limit=10):
     """Get user's message history with admins - fixed version"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
             SELECT message_id, user_message, timestamp, replied, admin_reply
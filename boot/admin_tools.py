@@ -4,9 +4,11 @@ Advanced admin tools for the confession bot
 
 import sqlite3
 import os
-import shutil
+import re
 import json
 import csv
+import gzip
+import shutil
 import zipfile
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
@@ -14,13 +16,105 @@ from dataclasses import dataclass
 import asyncio
 import aiofiles
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 from config import DB_PATH, BACKUPS_DIR, EXPORTS_DIR, ADMIN_IDS
+from db_connection import get_sqlite_pool
 from logger import get_logger
 from error_handler import handle_database_errors
 from analytics import analytics_manager
 
 logger = get_logger('admin_tools')
 
+# Rows fetched from SQLite and handed to the CSV writer per batch during exports
+EXPORT_BATCH_SIZE = 1000
+
+# Stay under SQLite's default host parameter limit when padding bulk IN lists
+SQLITE_MAX_IN_PARAMS = 900
+
+
+def _fts_phrase(query: str) -> str:
+    """Quote a free-text query as a single FTS5 phrase, prefix-matching the last word"""
+    return '"' + query.replace('"', '""') + '"*'
+
+
+def _write_json(filepath: str, data: Any):
+    """Write data as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        # Pass datetimes through to default=str so output matches the json fallback
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=options))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str)
+
+
+def _in_clause(ids: List[int]) -> Tuple[str, List[Optional[int]]]:
+    """
+    Build placeholders and parameters for a bulk IN (...) list, rounding its
+    arity up to the next power of two and padding with NULLs.
+
+    NULL never matches IN, so the padding is harmless, and the writer's
+    statement cache can reuse one prepared plan per size bucket.
+    """
+    size = 1
+    while size < len(ids):
+        size *= 2
+    if size > SQLITE_MAX_IN_PARAMS:
+        size = len(ids)
+    return ','.join(['?'] * size), list(ids) + [None] * (size - len(ids))
+
+
+_DATE_RE = re.compile(r'(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})')
+
+
+def _normalize_date(date_str: str) -> Optional[str]:
+    """Canonical 'YYYY-MM-DD' form of an admin-entered date, or None if it isn't one"""
+    match = _DATE_RE.fullmatch(date_str.strip())
+    if not match:
+        return None
+    try:
+        return datetime(*map(int, match.groups())).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _normalize_date_range(date_from: Optional[str], date_to: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Validate optional date filters before they reach the query.
+    Returns (date_from, date_to, error_message); the error is None when both are usable.
+    """
+    normalized = []
+    for date_str in (date_from, date_to):
+        if not date_str or not date_str.strip():
+            normalized.append(None)
+            continue
+        date = _normalize_date(date_str)
+        if date is None:
+            return None, None, f"Invalid date '{date_str.strip()}': use YYYY-MM-DD"
+        normalized.append(date)
+    return normalized[0], normalized[1], None
+
+
+def _day_start(date_str: str) -> str:
+    """Inclusive lower timestamp bound for a 'YYYY-MM-DD' date"""
+    return f"{date_str} 00:00:00"
+
+
+def _next_day_start(date_str: str) -> str:
+    """Exclusive upper timestamp bound covering the whole 'YYYY-MM-DD' date"""
+    next_day = datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=1)
+    return next_day.strftime('%Y-%m-%d 00:00:00')
+
 
 @dataclass
 class SearchResult:
@@ -53,7 +147,14 @@ class SearchManager:
                       date_from: str = None, date_to: str = None,
                       user_id: int = None, limit: int = 50) -> List[SearchResult]:
         """Search through posts and comments"""
-        with sqlite3.connect(DB_PATH) as conn:
+        date_from, date_to, date_error = _normalize_date_range(date_from, date_to)
+        if date_error:
+            return None, date_error
+        
+        # A blank query means "no content filter", not a match on whitespace
+        query = query.strip() if query else ""
+        
+        with get_sqlite_pool().connection() as conn:
             cursor = conn.cursor()
             results = []
             
@@ -62,21 +163,26 @@ class SearchManager:
                 post_query = """
                     SELECT p.post_id, p.content, p.user_id, p.timestamp, p.category, p.status, p.flagged
                     FROM posts p
-                    WHERE p.content LIKE ?
+                    WHERE 1=1
                 """
-                params = [f"%{query}%"]
+                params = []
+                
+                # Cheap indexed filters first, the full-text match last
+                if user_id:
+                    post_query += " AND p.user_id = ?"
+                    params.append(user_id)
                 
                 if date_from:
-                    post_query += " AND DATE(p.timestamp) >= ?"
-                    params.append(date_from)
+                    post_query += " AND p.timestamp >= ?"
+                    params.append(_day_start(date_from))
                 
                 if date_to:
-                    post_query += " AND DATE(p.timestamp) <= ?"
-                    params.append(date_to)
+                    post_query += " AND p.timestamp < ?"
+                    params.append(_next_day_start(date_to))
                 
-                if user_id:
-                    post_query += " AND p.user_id = ?"
-                    params.append(user_id)
+                if query:
+                    post_query += " AND p.post_id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)"
+                    params.append(_fts_phrase(query))
                 
                 post_query += " ORDER BY p.timestamp DESC LIMIT ?"
                 params.append(limit // 2 if content_type == "all" else limit)
@@ -102,21 +208,26 @@ class SearchManager:
                 comment_query = """
                     SELECT c.comment_id, c.content, c.user_id, c.timestamp, c.post_id, c.likes, c.dislikes, c.flagged
                     FROM comments c
-                    WHERE c.content LIKE ?
+                    WHERE 1=1
                 """
-                params = [f"%{query}%"]
+                params = []
+                
+                # Cheap indexed filters first, the full-text match last
+                if user_id:
+                    comment_query += " AND c.user_id = ?"
+                    params.append(user_id)
                 
                 if date_from:
-                    comment_query += " AND DATE(c.timestamp) >= ?"
-                    params.append(date_from)
+                    comment_query += " AND c.timestamp >= ?"
+                    params.append(_day_start(date_from))
                 
                 if date_to:
-                    comment_query += " AND DATE(c.timestamp) <= ?"
-                    params.append(date_to)
+                    comment_query += " AND c.timestamp < ?"
+                    params.append(_next_day_start(date_to))
                 
-                if user_id:
-                    comment_query += " AND c.user_id = ?"
-                    params.append(user_id)
+                if query:
+                    comment_query += " AND c.comment_id IN (SELECT rowid FROM comments_fts WHERE comments_fts MATCH ?)"
+                    params.append(_fts_phrase(query))
                 
                 comment_query += " ORDER BY c.timestamp DESC LIMIT ?"
                 params.append(limit // 2 if content_type == "all" else limit)
@@ -142,20 +253,19 @@ class SearchManager:
     
     @handle_database_errors
     def search_users(self, query: str, include_blocked: bool = True) -> List[Dict[str, Any]]:
-        """Search for users"""
-        with sqlite3.connect(DB_PATH) as conn:
+        """Search for users by name or user ID"""
+        with get_sqlite_pool().connection() as conn:
             cursor = conn.cursor()
             
             user_query = """
                 SELECT u.user_id, u.username, u.first_name, u.last_name, u.join_date, u.blocked,
-                       COUNT(DISTINCT p.post_id) as post_count,
-                       COUNT(DISTINCT c.comment_id) as comment_count
+                       (SELECT COUNT(*) FROM posts p WHERE p.user_id = u.user_id) as post_count,
+                       (SELECT COUNT(*) FROM comments c WHERE c.user_id = u.user_id) as comment_count
                 FROM users u
-                LEFT JOIN posts p ON u.user_id = p.user_id
-                LEFT JOIN comments c ON u.user_id = c.user_id
                 WHERE (u.username LIKE ? OR u.first_name LIKE ? OR u.last_name LIKE ? OR u.user_id = ?)
             """
-            params = [f"%{query}%", f"%{query}%", f"%{query}%"]
+            pattern = f"%{query}%"
+            params = [pattern, pattern, pattern]
             
             # Try to parse query as user_id
             try:
@@ -167,7 +277,7 @@ class SearchManager:
             if not include_blocked:
                 user_query += " AND u.blocked = 0"
             
-            user_query += " GROUP BY u.user_id ORDER BY u.join_date DESC LIMIT 20"
+            user_query += " ORDER BY u.join_date DESC LIMIT 20"
             
             cursor.execute(user_query, params)
             
@@ -193,20 +303,25 @@ class BulkActionsManager:
     @handle_database_errors
     def bulk_approve_posts(self, post_ids: List[int], admin_id: int) -> Dict[str, Any]:
         """Bulk approve multiple posts"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             
-            # Get posts to approve
-            placeholders = ','.join(['?' for _ in post_ids])
+            # Take the write lock up front so the whole batch runs in one transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Log the eligible posts straight from the table, then approve the same
+            # rows; the IMMEDIATE transaction keeps both statements consistent
+            placeholders, id_params = _in_clause(post_ids)
             cursor.execute(f"""
-                SELECT post_id, content, category, user_id
-                FROM posts 
+                INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
+                SELECT ?, 'post', post_id, 'bulk_approve', 'Bulk approval by admin'
+                FROM posts
                 WHERE post_id IN ({placeholders}) AND (status = 'pending' OR status IS NULL)
-            """, post_ids)
+            """, [admin_id, *id_params])
             
-            posts_to_approve = cursor.fetchall()
+            approved_count = cursor.rowcount
             
-            if not posts_to_approve:
+            if not approved_count:
                 return {"success": False, "message": "No eligible posts found for approval"}
             
             # Approve posts
@@ -214,16 +329,7 @@ class BulkActionsManager:
                 UPDATE posts 
                 SET status = 'approved' 
                 WHERE post_id IN ({placeholders}) AND (status = 'pending' OR status IS NULL)
-            """, post_ids)
-            
-            approved_count = cursor.rowcount
-            
-            # Log moderation actions
-            for post_id, content, category, user_id in posts_to_approve:
-                cursor.execute("""
-                    INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
-                    VALUES (?, 'post', ?, 'bulk_approve', 'Bulk approval by admin')
-                """, (admin_id, post_id))
+            """, id_params)
             
             conn.commit()
             
@@ -236,20 +342,25 @@ class BulkActionsManager:
     @handle_database_errors
     def bulk_reject_posts(self, post_ids: List[int], admin_id: int, reason: str = "") -> Dict[str, Any]:
         """Bulk reject multiple posts"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             
-            # Get posts to reject
-            placeholders = ','.join(['?' for _ in post_ids])
+            # Take the write lock up front so the whole batch runs in one transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Log the eligible posts straight from the table, then reject the same
+            # rows; the IMMEDIATE transaction keeps both statements consistent
+            placeholders, id_params = _in_clause(post_ids)
             cursor.execute(f"""
-                SELECT post_id, content, category, user_id
-                FROM posts 
+                INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
+                SELECT ?, 'post', post_id, 'bulk_reject', ?
+                FROM posts
                 WHERE post_id IN ({placeholders}) AND (status = 'pending' OR status IS NULL)
-            """, post_ids)
+            """, [admin_id, reason or "Bulk rejection by admin", *id_params])
             
-            posts_to_reject = cursor.fetchall()
+            rejected_count = cursor.rowcount
             
-            if not posts_to_reject:
+            if not rejected_count:
                 return {"success": False, "message": "No eligible posts found for rejection"}
             
             # Reject posts
@@ -257,16 +368,7 @@ class BulkActionsManager:
                 UPDATE posts 
                 SET status = 'rejected' 
                 WHERE post_id IN ({placeholders}) AND (status = 'pending' OR status IS NULL)
-            """, post_ids)
-            
-            rejected_count = cursor.rowcount
-            
-            # Log moderation actions
-            for post_id, content, category, user_id in posts_to_reject:
-                cursor.execute("""
-                    INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
-                    VALUES (?, 'post', ?, 'bulk_reject', ?)
-                """, (admin_id, post_id, reason or "Bulk rejection by admin"))
+            """, id_params)
             
             conn.commit()
             
@@ -279,65 +381,76 @@ class BulkActionsManager:
     @handle_database_errors
     def bulk_delete_comments(self, comment_ids: List[int], admin_id: int, reason: str = "") -> Dict[str, Any]:
         """Bulk delete comments"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             
-            # Log deletions first
-            placeholders = ','.join(['?' for _ in comment_ids])
+            # Take the write lock up front so the whole batch runs in one transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Log deletions first, straight from the comments that exist
+            placeholders, id_params = _in_clause(comment_ids)
             cursor.execute(f"""
-                SELECT comment_id, content, user_id
+                INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
+                SELECT ?, 'comment', comment_id, 'bulk_delete', ?
                 FROM comments 
                 WHERE comment_id IN ({placeholders})
-            """, comment_ids)
-            
-            comments_to_delete = cursor.fetchall()
+            """, [admin_id, reason or "Bulk deletion by admin", *id_params])
             
-            for comment_id, content, user_id in comments_to_delete:
-                cursor.execute("""
-                    INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
-                    VALUES (?, 'comment', ?, 'bulk_delete', ?)
-                """, (admin_id, comment_id, reason or "Bulk deletion by admin"))
+            # trg_comments_delete_cascade also removes the direct replies, which
+            # the DELETE's rowcount doesn't include, so count them up front
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM comments
+                WHERE comment_id IN ({placeholders}) OR parent_comment_id IN ({placeholders})
+            """, id_params * 2)
+            deleted_count = cursor.fetchone()[0]
             
             # Delete comments
             cursor.execute(f"""
                 DELETE FROM comments 
                 WHERE comment_id IN ({placeholders})
-            """, comment_ids)
+            """, id_params)
             
-            deleted_count = cursor.rowcount
             conn.commit()
             
             return {
                 "success": True,
                 "deleted_count": deleted_count,
-                "message": f"Successfully deleted {deleted_count} comments"
+                "message": f"Successfully deleted {deleted_count} comments (including replies)"
             }
     
     @handle_database_errors
     def bulk_block_users(self, user_ids: List[int], admin_id: int, reason: str = "") -> Dict[str, Any]:
         """Bulk block users"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             
+            # Take the write lock up front so the whole batch runs in one transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Log the users about to be blocked, then block the same rows
+            placeholders, id_params = _in_clause(user_ids)
+            cursor.execute(f"""
+                INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
+                SELECT ?, 'user', user_id, 'bulk_block', ?
+                FROM users
+                WHERE user_id IN ({placeholders}) AND blocked = 0
+            """, [admin_id, reason or "Bulk block by admin", *id_params])
+            
             # Update users
-            placeholders = ','.join(['?' for _ in user_ids])
             cursor.execute(f"""
                 UPDATE users 
                 SET blocked = 1 
                 WHERE user_id IN ({placeholders}) AND blocked = 0
-            """, user_ids)
+            """, id_params)
             
             blocked_count = cursor.rowcount
             
-            # Log actions
-            for user_id in user_ids:
-                cursor.execute("""
-                    INSERT INTO moderation_log (moderator_id, target_type, target_id, action, reason)
-                    VALUES (?, 'user', ?, 'bulk_block', ?)
-                """, (admin_id, user_id, reason or "Bulk block by admin"))
-            
             conn.commit()
             
+            from approval import invalidate_blocked_cache
+            for user_id in user_ids:
+                invalidate_blocked_cache(user_id)
+            
             return {
                 "success": True,
                 "blocked_count": blocked_count,
@@ -354,25 +467,43 @@ class BackupManager:
         os.makedirs(EXPORTS_DIR, exist_ok=True)
     
     @handle_database_errors
-    def create_backup(self, backup_type: str = "manual") -> Tuple[bool, str]:
-        """Create a database backup"""
+    async def create_backup(self, backup_type: str = "manual") -> Tuple[bool, str]:
+        """Create a database backup in a worker thread so the event loop keeps running"""
+        return await asyncio.to_thread(self._create_backup_file, backup_type)
+    
+    def _create_backup_file(self, backup_type: str) -> Tuple[bool, str]:
+        """Copy the database, checksum it and record the backup metadata"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"confession_bot_backup_{timestamp}.db"
-            backup_path = os.path.join(BACKUPS_DIR, backup_filename)
+            backup_path = os.path.join(BACKUPS_DIR, f"confession_bot_backup_{timestamp}.db")
             
-            # Copy database file
-            shutil.copy2(DB_PATH, backup_path)
+            # Copy the database with SQLite's online backup API; unlike a raw file
+            # copy this is consistent while the bot keeps writing and includes
+            # pages still sitting in the WAL
+            with get_sqlite_pool().connection() as source:
+                backup_conn = sqlite3.connect(backup_path)
+                try:
+                    source.backup(backup_conn)
+                    # Count records on the copy we already have open
+                    record_count = self._get_database_record_count(backup_conn)
+                finally:
+                    backup_conn.close()
             
-            # Get file size and record count
-            file_size = os.path.getsize(backup_path)
-            record_count = self._get_database_record_count()
+            raw_size = os.path.getsize(backup_path)
             
-            # Calculate checksum
+            # Checksum the uncompressed database so restores can be verified
             checksum = self._calculate_file_checksum(backup_path)
             
+            # Compress the copy; mostly-empty pages shrink several times over
+            try:
+                compressed_path = self._compress_backup_file(backup_path)
+            finally:
+                os.remove(backup_path)
+            backup_filename = os.path.basename(compressed_path)
+            file_size = os.path.getsize(compressed_path)
+            
             # Save backup metadata
-            with sqlite3.connect(DB_PATH) as conn:
+            with get_sqlite_pool().writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO backup_metadata (filename, file_size, record_count, backup_type, checksum)
@@ -380,17 +511,30 @@ class BackupManager:
                 """, (backup_filename, file_size, record_count, backup_type, checksum))
                 conn.commit()
             
-            logger.info(f"Backup created successfully: {backup_filename}")
+            logger.info(f"Backup created successfully: {backup_filename} ({raw_size} bytes uncompressed, {file_size} bytes compressed)")
             return True, backup_filename
             
         except Exception as e:
             logger.error(f"Backup creation failed: {e}")
             return False, str(e)
     
+    def _compress_backup_file(self, backup_path: str) -> str:
+        """Compress a backup with zstd when available, else gzip, and return the new path"""
+        if zstd is not None:
+            compressed_path = f"{backup_path}.zst"
+            cctx = zstd.ZstdCompressor(level=3, threads=-1)
+            with open(backup_path, 'rb') as f_in, open(compressed_path, 'wb') as f_out:
+                cctx.copy_stream(f_in, f_out)
+        else:
+            compressed_path = f"{backup_path}.gz"
+            with open(backup_path, 'rb') as f_in, gzip.open(compressed_path, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out, 1 << 20)
+        return compressed_path
+    
     @handle_database_errors
     def get_backup_list(self) -> List[BackupInfo]:
         """Get list of available backups"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT backup_id, filename, file_size, record_count, backup_type, created_at, checksum
@@ -410,7 +554,7 @@ class BackupManager:
             
             backups_to_delete = backups[keep_count:]
             
-            with sqlite3.connect(DB_PATH) as conn:
+            with get_sqlite_pool().writer() as conn:
                 cursor = conn.cursor()
                 
                 for backup in backups_to_delete:
@@ -429,32 +573,61 @@ class BackupManager:
         except Exception as e:
             logger.error(f"Backup cleanup failed: {e}")
     
-    def _get_database_record_count(self) -> int:
-        """Get total number of records in database"""
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            tables = ['posts', 'comments', 'users', 'reactions', 'reports', 'admin_messages']
-            total_count = 0
-            
-            for table in tables:
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    total_count += cursor.fetchone()[0]
-                except sqlite3.OperationalError:
-                    pass  # Table might not exist
-            
-            return total_count
+    def _get_database_record_count(self, conn: sqlite3.Connection = None) -> int:
+        """Get total number of records in the database, or in an open copy of it"""
+        if conn is None:
+            with get_sqlite_pool().connection() as conn:
+                return self._get_database_record_count(conn)
+        
+        cursor = conn.cursor()
+        
+        tables = ['posts', 'comments', 'users', 'reactions', 'reports', 'admin_messages']
+        
+        try:
+            # Only count tables that exist, then sum them in a single statement
+            placeholders = ','.join('?' * len(tables))
+            cursor.execute(f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})", tables)
+            existing = [row[0] for row in cursor.fetchall()]
+            if not existing:
+                return 0
+            
+            counts = " UNION ALL ".join(f"SELECT COUNT(*) AS c FROM {table}" for table in existing)
+            cursor.execute(f"SELECT COALESCE(SUM(c), 0) FROM ({counts})")
+            return cursor.fetchone()[0]
+        except sqlite3.OperationalError as e:
+            logger.error(f"Failed to count database records: {e}")
+            return 0
     
     def _calculate_file_checksum(self, file_path: str) -> str:
         """Calculate MD5 checksum of file"""
         import hashlib
+        import mmap
         
-        hash_md5 = hashlib.md5()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            # Hash the memory-mapped file in a single update so OpenSSL reads the
+            # pages directly; mmap can't map empty files and may be unsupported
+            if os.fstat(f.fileno()).st_size:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if hasattr(mmap, "MADV_SEQUENTIAL"):
+                            mapped.madvise(mmap.MADV_SEQUENTIAL)
+                        return hashlib.md5(mapped).hexdigest()
+                except (OSError, ValueError):
+                    pass
+            
+            # Python 3.11+ hashes the file in C without per-chunk Python calls
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "md5").hexdigest()
+            
+            hash_md5 = hashlib.md5()
+            buffer = bytearray(1 << 20)
+            view = memoryview(buffer)
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                hash_md5.update(view[:size])
+            return hash_md5.hexdigest()
 
 
 class ExportManager:
@@ -467,31 +640,36 @@ class ExportManager:
     def export_posts_csv(self, date_from: str = None, date_to: str = None, 
                         status_filter: str = None) -> Tuple[bool, str]:
         """Export posts to CSV"""
+        date_from, date_to, date_error = _normalize_date_range(date_from, date_to)
+        if date_error:
+            return False, date_error
+        
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"posts_export_{timestamp}.csv"
             filepath = os.path.join(EXPORTS_DIR, filename)
             
-            with sqlite3.connect(DB_PATH) as conn:
+            with get_sqlite_pool().connection() as conn:
                 cursor = conn.cursor()
                 
+                # Count comments per post with an index lookup instead of joining
+                # and aggregating the whole comments table
                 query = """
                     SELECT p.post_id, p.content, p.category, p.timestamp, p.user_id, 
                            p.status, p.flagged, p.likes, p.sentiment_score, p.sentiment_label,
-                           COUNT(c.comment_id) as comment_count
+                           (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.post_id) as comment_count
                     FROM posts p
-                    LEFT JOIN comments c ON p.post_id = c.post_id
                     WHERE 1=1
                 """
                 params = []
                 
                 if date_from:
-                    query += " AND DATE(p.timestamp) >= ?"
-                    params.append(date_from)
+                    query += " AND p.timestamp >= ?"
+                    params.append(_day_start(date_from))
                 
                 if date_to:
-                    query += " AND DATE(p.timestamp) <= ?"
-                    params.append(date_to)
+                    query += " AND p.timestamp < ?"
+                    params.append(_next_day_start(date_to))
                 
                 if status_filter == 'approved':
                     query += " AND p.status = 'approved'"
@@ -500,7 +678,7 @@ class ExportManager:
                 elif status_filter == 'pending':
                     query += " AND (p.status = 'pending' OR p.status IS NULL)"
                 
-                query += " GROUP BY p.post_id ORDER BY p.timestamp DESC"
+                query += " ORDER BY p.timestamp DESC"
                 
                 cursor.execute(query, params)
                 
@@ -514,9 +692,12 @@ class ExportManager:
                         'Comment Count'
                     ])
                     
-                    # Write data
-                    for row in cursor.fetchall():
-                        writer.writerow(row)
+                    # Stream rows in batches instead of materializing the whole result
+                    while True:
+                        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                        if not rows:
+                            break
+                        writer.writerows(rows)
             
             logger.info(f"Posts exported to CSV: {filename}")
             return True, filename
@@ -537,8 +718,7 @@ class ExportManager:
             report = analytics_manager.generate_comprehensive_report(days_back)
             
             # Save to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, default=str)
+            _write_json(filepath, report)
             
             logger.info(f"Analytics report exported: {filename}")
             return True, filename
@@ -555,8 +735,11 @@ class ExportManager:
             filename = f"user_data_export_{user_id}_{timestamp}.json"
             filepath = os.path.join(EXPORTS_DIR, filename)
             
-            with sqlite3.connect(DB_PATH) as conn:
+            with get_sqlite_pool().connection() as conn:
                 cursor = conn.cursor()
+                # sqlite3.Row keeps the column names, so rows convert straight to dicts
+                # (set on the cursor, not the pooled connection)
+                cursor.row_factory = sqlite3.Row
                 
                 # Get user info
                 cursor.execute("""
@@ -568,37 +751,33 @@ class ExportManager:
                 if not user_info:
                     return False, "User not found"
                 
-                # Get posts
+                # Get posts, comments, reactions and admin messages in one query;
+                # each row is tagged with its source and built as a JSON object
                 cursor.execute("""
-                    SELECT post_id, content, category, timestamp, status, flagged, likes
-                    FROM posts WHERE user_id = ?
+                    SELECT 'posts', json_object(
+                        'post_id', post_id, 'content', content, 'category', category,
+                        'timestamp', timestamp, 'status', status, 'flagged', flagged, 'likes', likes)
+                    FROM posts WHERE user_id = ?1
+                    UNION ALL
+                    SELECT 'comments', json_object(
+                        'comment_id', comment_id, 'post_id', post_id, 'content', content,
+                        'timestamp', timestamp, 'likes', likes, 'dislikes', dislikes, 'flagged', flagged)
+                    FROM comments WHERE user_id = ?1
+                    UNION ALL
+                    SELECT 'reactions', json_object(
+                        'target_type', target_type, 'target_id', target_id,
+                        'reaction_type', reaction_type, 'timestamp', timestamp)
+                    FROM reactions WHERE user_id = ?1
+                    UNION ALL
+                    SELECT 'admin_messages', json_object(
+                        'message_id', message_id, 'user_message', user_message, 'admin_reply', admin_reply,
+                        'timestamp', timestamp, 'replied', replied)
+                    FROM admin_messages WHERE user_id = ?1
                 """, (user_id,))
-                posts = [dict(zip([col[0] for col in cursor.description], row)) 
-                        for row in cursor.fetchall()]
                 
-                # Get comments
-                cursor.execute("""
-                    SELECT comment_id, post_id, content, timestamp, likes, dislikes, flagged
-                    FROM comments WHERE user_id = ?
-                """, (user_id,))
-                comments = [dict(zip([col[0] for col in cursor.description], row)) 
-                           for row in cursor.fetchall()]
-                
-                # Get reactions
-                cursor.execute("""
-                    SELECT target_type, target_id, reaction_type, timestamp
-                    FROM reactions WHERE user_id = ?
-                """, (user_id,))
-                reactions = [dict(zip([col[0] for col in cursor.description], row)) 
-                           for row in cursor.fetchall()]
-                
-                # Get admin messages
-                cursor.execute("""
-                    SELECT message_id, user_message, admin_reply, timestamp, replied
-                    FROM admin_messages WHERE user_id = ?
-                """, (user_id,))
-                messages = [dict(zip([col[0] for col in cursor.description], row)) 
-                           for row in cursor.fetchall()]
+                user_records = {'posts': [], 'comments': [], 'reactions': [], 'admin_messages': []}
+                for source, record in cursor.fetchall():
+                    user_records[source].append(json.loads(record))
                 
                 # Compile export data
                 export_data = {
@@ -607,16 +786,15 @@ class ExportManager:
                         "export_timestamp": datetime.now().isoformat(),
                         "export_type": "complete_user_data"
                     },
-                    "user_info": dict(zip(['user_id', 'username', 'first_name', 'last_name', 'join_date', 'blocked'], user_info)),
-                    "posts": posts,
-                    "comments": comments,
-                    "reactions": reactions,
-                    "admin_messages": messages
+                    "user_info": dict(user_info),
+                    "posts": user_records['posts'],
+                    "comments": user_records['comments'],
+                    "reactions": user_records['reactions'],
+                    "admin_messages": user_records['admin_messages']
                 }
                 
                 # Save to file
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, default=str)
+                _write_json(filepath, export_data)
             
             logger.info(f"User data exported: {filename}")
             return True, filename
@@ -638,7 +816,7 @@ class AutomationManager:
             logger.info("Starting daily maintenance tasks")
             
             # Create automated backup
-            success, result = self.backup_manager.create_backup("auto")
+            success, result = await self.backup_manager.create_backup("auto")
             if success:
                 logger.info(f"Daily backup created: {result}")
             else:
@@ -664,38 +842,50 @@ class AutomationManager:
     @handle_database_errors
     async def _cleanup_old_notifications(self, days_old: int = 30):
         """Clean up old notifications"""
-        cutoff_date = (datetime.now() - timedelta(days=days_old)).strftime('%Y-%m-%d')
+        cutoff_date = (datetime.now() - timedelta(days=days_old)).strftime('%Y-%m-%d 00:00:00')
+        
+        deleted_count = await asyncio.to_thread(self._delete_old_notifications, cutoff_date)
         
-        with sqlite3.connect(DB_PATH) as conn:
+        if deleted_count > 0:
+            logger.info(f"Cleaned up {deleted_count} old notifications")
+    
+    def _delete_old_notifications(self, cutoff_date: str) -> int:
+        """Delete read notifications created before cutoff_date"""
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM notifications 
-                WHERE read = 1 AND DATE(created_at) < ?
+                WHERE read = 1 AND created_at < ?
             """, (cutoff_date,))
             
             deleted_count = cursor.rowcount
             conn.commit()
             
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} old notifications")
+            return deleted_count
     
     @handle_database_errors
     async def _cleanup_old_activity_logs(self, days_old: int = 90):
         """Clean up old activity logs"""
-        cutoff_date = (datetime.now() - timedelta(days=days_old)).strftime('%Y-%m-%d')
+        cutoff_date = (datetime.now() - timedelta(days=days_old)).strftime('%Y-%m-%d 00:00:00')
+        
+        deleted_count = await asyncio.to_thread(self._delete_old_activity_logs, cutoff_date)
         
-        with sqlite3.connect(DB_PATH) as conn:
+        if deleted_count > 0:
+            logger.info(f"Cleaned up {deleted_count} old activity log entries")
+    
+    def _delete_old_activity_logs(self, cutoff_date: str) -> int:
+        """Delete activity log entries recorded before cutoff_date"""
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM user_activity_log 
-                WHERE DATE(timestamp) < ?
+                WHERE timestamp < ?
             """, (cutoff_date,))
             
             deleted_count = cursor.rowcount
             conn.commit()
             
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} old activity log entries")
+            return deleted_count
 
 
 # Global instances
@@ -732,25 +922,31 @@ def format_search_results(results: List[SearchResult], max_content_length: int =
     if not results:
         return "No results found."
     
-    formatted = f"Found {len(results)} results:\n\n"
+    parts = [f"Found {len(results)} results:\n\n"]
     
     for i, result in enumerate(results, 1):
         content_preview = result.content[:max_content_length] + "..." if len(result.content) > max_content_length else result.content
         
-        formatted += f"{i}. {result.type.title()} ID: {result.id}\n"
-        formatted += f"   User: {result.user_id}\n"
-        formatted += f"   Date: {result.timestamp}\n"
-        formatted += f"   Content: {content_preview}\n"
+        parts.append(
+            f"{i}. {result.type.title()} ID: {result.id}\n"
+            f"   User: {result.user_id}\n"
+            f"   Date: {result.timestamp}\n"
+            f"   Content: {content_preview}\n"
+        )
         
         if result.type == "post":
-            formatted += f"   Category: {result.metadata.get('category', 'N/A')}\n"
             status = result.metadata.get('status')
             status_text = status.title() if status else 'Pending'
-            formatted += f"   Status: {status_text}\n"
+            parts.append(
+                f"   Category: {result.metadata.get('category', 'N/A')}\n"
+                f"   Status: {status_text}\n"
+            )
         elif result.type == "comment":
-            formatted += f"   Post ID: {result.metadata.get('post_id')}\n"
-            formatted += f"   Likes: {result.metadata.get('likes', 0)} | Dislikes: {result.metadata.get('dislikes', 0)}\n"
+            parts.append(
+                f"   Post ID: {result.metadata.get('post_id')}\n"
+                f"   Likes: {result.metadata.get('likes', 0)} | Dislikes: {result.metadata.get('dislikes', 0)}\n"
+            )
         
-        formatted += "\n"
+        parts.append("\n")
     
-    return formatted
+    return "".join(parts)
@@ -3,78 +3,239 @@ Admin User Activity Management Module
 This module provides functions for displaying user posts and comments in the admin dashboard.
 """
 
+import asyncio
 import logging
+import threading
+import time
+from functools import lru_cache, wraps
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from utils import escape_markdown_text, truncate_text, format_time_ago
-from db import get_db
+from utils import escape_markdown_text, truncate_text, format_seconds_ago
+from db_connection import get_sqlite_pool
 from config import CHANNEL_ID
 
 logger = logging.getLogger(__name__)
 
+# Shared navigation buttons, built once instead of on every error/empty path
+_BACK_TO_SEARCH_BUTTON = InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
+_ADMIN_DASHBOARD_BUTTON = InlineKeyboardButton("🔧 Admin Dashboard", callback_data="admin_dashboard")
+_BACK_TO_SEARCH_KB = InlineKeyboardMarkup([[_BACK_TO_SEARCH_BUTTON]])
+
+# Channel id as used in t.me/c/ links
+_CHANNEL_ID_STR = str(CHANNEL_ID).replace('-100', '')
+_UNKNOWN_TIME = escape_markdown_text("unknown time")
+
+# Categories come from a small fixed set, so their escaped form is cached
+_escape_category = lru_cache(maxsize=256)(escape_markdown_text)
+
+# Telegram caps messages at 4096 characters; leave headroom for escaping
+MAX_COMBINED_MESSAGE_LENGTH = 3800
+CARD_SEPARATOR = "\n\n——\n\n"
+
+def _combine_cards(cards: list) -> list:
+    """Pack (text, button_row) cards into as few (text, reply_markup) messages as fit"""
+    messages = []
+    texts, rows, length = [], [], 0
+    for text, row in cards:
+        added = len(text) + (len(CARD_SEPARATOR) if texts else 0)
+        if texts and length + added > MAX_COMBINED_MESSAGE_LENGTH:
+            messages.append((CARD_SEPARATOR.join(texts), InlineKeyboardMarkup(rows)))
+            texts, rows, length = [], [], 0
+            added = len(text)
+        texts.append(text)
+        rows.append(row)
+        length += added
+    if texts:
+        messages.append((CARD_SEPARATOR.join(texts), InlineKeyboardMarkup(rows)))
+    return messages
+
+# Listing queries live at module level so each pooled connection's statement
+# cache keeps reusing the same prepared statements.
+# The epoch conversion is done in the outer SELECT, so it only runs on the
+# 20/25 rows the `recent` CTE keeps, which come ordered by the (user_id,
+# timestamp) indexes. A stored epoch column would save only those few
+# strftime calls, and every writer of posts/comments would have to keep it in step.
+_USER_SQL = "SELECT username, first_name, last_name FROM users WHERE user_id = ?"
+
+# A user's 20 most recent posts in any status, with comments counted for
+# just those posts
+_POSTS_SQL = """
+    WITH recent AS (
+        SELECT post_id, content, category, timestamp, approved,
+               media_type, channel_message_id, flagged
+        FROM posts
+        WHERE user_id = ?
+        ORDER BY timestamp DESC
+        LIMIT 20
+    ),
+    comment_counts AS (
+        SELECT post_id, COUNT(*) as comment_count
+        FROM comments
+        WHERE post_id IN (SELECT post_id FROM recent)
+        GROUP BY post_id
+    )
+    SELECT 
+        p.post_id, p.content, p.category,
+        CAST(strftime('%s', p.timestamp) AS INTEGER) as timestamp_epoch, p.approved, 
+        COALESCE(cc.comment_count, 0) as comment_count,
+        p.media_type, p.channel_message_id, p.flagged
+    FROM recent p
+    LEFT JOIN comment_counts cc ON cc.post_id = p.post_id
+    ORDER BY p.timestamp DESC
+"""
+
+# A user's 25 most recent comments, with reactions and replies aggregated for
+# just those comments instead of three subqueries per row
+_COMMENTS_SQL = """
+    WITH recent AS (
+        SELECT comment_id, post_id, content, timestamp, parent_comment_id, flagged
+        FROM comments
+        WHERE user_id = ?
+        ORDER BY timestamp DESC
+        LIMIT 25
+    ),
+    reaction_counts AS (
+        SELECT target_id,
+               SUM(CASE WHEN reaction_type = 'like' THEN 1 ELSE 0 END) as likes,
+               SUM(CASE WHEN reaction_type = 'dislike' THEN 1 ELSE 0 END) as dislikes
+        FROM reactions
+        WHERE target_type = 'comment' AND target_id IN (SELECT comment_id FROM recent)
+        GROUP BY target_id
+    ),
+    reply_counts AS (
+        SELECT parent_comment_id, COUNT(*) as reply_count
+        FROM comments
+        WHERE parent_comment_id IN (SELECT comment_id FROM recent)
+        GROUP BY parent_comment_id
+    )
+    SELECT 
+        c.comment_id, c.post_id, c.content,
+        CAST(strftime('%s', c.timestamp) AS INTEGER) as timestamp_epoch, c.parent_comment_id, c.flagged,
+        COALESCE(rc.likes, 0) as likes,
+        COALESCE(rc.dislikes, 0) as dislikes,
+        COALESCE(rp.reply_count, 0) as reply_count,
+        p.category as post_category
+    FROM recent c
+    LEFT JOIN reaction_counts rc ON rc.target_id = c.comment_id
+    LEFT JOIN reply_counts rp ON rp.parent_comment_id = c.comment_id
+    LEFT JOIN posts p ON c.post_id = p.post_id
+    ORDER BY c.timestamp DESC
+"""
+
+# Admins re-open the same user's lists while paging back and forth; a few
+# seconds of staleness is fine, and moderation actions clear the cache
+USER_ACTIVITY_CACHE_TTL = 3
+USER_ACTIVITY_CACHE_SIZE = 512
+
+def _ttl_cached(func):
+    """Cache a per-user fetch for USER_ACTIVITY_CACHE_TTL seconds"""
+    cache = {}
+    # Fetches run in asyncio.to_thread workers, so guard every cache access;
+    # the query itself runs outside the lock
+    lock = threading.Lock()
+    
+    @wraps(func)
+    def wrapper(user_id: int):
+        with lock:
+            now = time.monotonic()
+            entry = cache.get(user_id)
+            if entry and entry[0] > now:
+                return entry[1]
+        
+        result = func(user_id)
+        
+        with lock:
+            now = time.monotonic()
+            if len(cache) >= USER_ACTIVITY_CACHE_SIZE:
+                for key in [key for key, (expires, _) in cache.items() if expires <= now]:
+                    del cache[key]
+                if len(cache) >= USER_ACTIVITY_CACHE_SIZE:
+                    cache.clear()
+            cache[user_id] = (now + USER_ACTIVITY_CACHE_TTL, result)
+        return result
+    
+    wrapper.cache = cache
+    wrapper.cache_lock = lock
+    return wrapper
+
+def invalidate_user_activity_cache(user_id: int = None):
+    """Drop cached posts/comments listings for one user, or for everyone"""
+    for fetch in (_fetch_user_posts, _fetch_user_comments):
+        with fetch.cache_lock:
+            if user_id is None:
+                fetch.cache.clear()
+            else:
+                fetch.cache.pop(user_id, None)
+
+@_ttl_cached
+def _fetch_user_posts(user_id: int):
+    """Load a user's name fields and their recent posts; runs in a worker thread"""
+    with get_sqlite_pool().connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(_USER_SQL, (user_id,))
+        user_data = cursor.fetchone()
+        if not user_data:
+            return None, []
+        
+        cursor.execute(_POSTS_SQL, (user_id,))
+        return user_data, cursor.fetchall()
+
+@_ttl_cached
+def _fetch_user_comments(user_id: int):
+    """Load a user's name fields and their recent comments; runs in a worker thread"""
+    with get_sqlite_pool().connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(_USER_SQL, (user_id,))
+        user_data = cursor.fetchone()
+        if not user_data:
+            return None, []
+        
+        cursor.execute(_COMMENTS_SQL, (user_id,))
+        return user_data, cursor.fetchall()
+
+def _parse_user_id(callback_data, prefix: str):
+    """Return the numeric user ID following prefix in callback data, or None"""
+    data = str(callback_data) if callback_data is not None else ""
+    if not data.startswith(prefix):
+        return None
+    user_id = data[len(prefix):]
+    # isdigit alone also accepts characters such as superscripts that int() rejects
+    if not (user_id.isascii() and user_id.isdigit()):
+        return None
+    return int(user_id)
+
 async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show detailed list of posts by a specific user"""
     query = update.callback_query
     await query.answer()
     
     # Extract user ID from callback data
-    try:
-        # Debug log
-        logger.info(f"Processing admin_user_posts_ callback with data: {query.data} (type: {type(query.data)})")
-        # Ensure query.data is a string
-        callback_data = str(query.data) if query.data is not None else ""
-        logger.info(f"Converted callback_data to string: '{callback_data}'")
-        user_id = int(callback_data.replace("admin_user_posts_", ""))
-        logger.info(f"Extracted user_id: {user_id}")
-    except (ValueError, AttributeError) as e:
-        logger.error(f"Invalid callback data for admin_user_posts_: {query.data}, error: {e}")
+    user_id = _parse_user_id(query.data, "admin_user_posts_")
+    if user_id is None:
+        logger.error(f"Invalid callback data for admin_user_posts_: {query.data}")
         await query.edit_message_text(
             "❌ *Invalid Request*\n\nThere was an error processing your request.",
             parse_mode="MarkdownV2",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-            ]])
+            reply_markup=_BACK_TO_SEARCH_KB
         )
         return
     
-    # Get posts by this user from the database
+    # Get posts by this user from the database without blocking the event loop
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get user info first
-            cursor.execute(
-                "SELECT username, first_name, last_name FROM users WHERE user_id = ?",
-                (user_id,)
+        user_data, posts = await asyncio.to_thread(_fetch_user_posts, user_id)
+        
+        if not user_data:
+            await query.edit_message_text(
+                "❌ *User Not Found*\n\nUnable to find user data.",
+                parse_mode="MarkdownV2",
+                reply_markup=_BACK_TO_SEARCH_KB
             )
-            user_data = cursor.fetchone()
-            
-            if not user_data:
-                await query.edit_message_text(
-                    "❌ *User Not Found*\n\nUnable to find user data.",
-                    parse_mode="MarkdownV2",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-                    ]])
-                )
-                return
-            
-            username, first_name, last_name = user_data
-            display_name = f"{first_name or ''} {last_name or ''}".strip() or username or "Anonymous"
-            
-            # Get all posts by this user, including both approved and pending
-            cursor.execute("""
-                SELECT 
-                    post_id, content, category, timestamp, approved, 
-                    (SELECT COUNT(*) FROM comments WHERE post_id = p.post_id) as comment_count,
-                    media_type, channel_message_id, flagged
-                FROM posts p
-                WHERE user_id = ?
-                ORDER BY timestamp DESC
-                LIMIT 20
-            """, (user_id,))
-            
-            posts = cursor.fetchall()
+            return
+        
+        username, first_name, last_name = user_data
+        display_name = f"{first_name or ''} {last_name or ''}".strip() or username or "Anonymous"
         
         if not posts:
             # No posts found
@@ -87,7 +248,7 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
                     InlineKeyboardButton("👤 User Info", callback_data=f"admin_user_info_{user_id}"),
                     InlineKeyboardButton("💬 View Comments", callback_data=f"admin_user_comments_{user_id}")
                 ], [
-                    InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
+                    _BACK_TO_SEARCH_BUTTON
                 ]])
             )
             return
@@ -110,14 +271,15 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
             parse_mode="MarkdownV2"
         )
         
-        # Send each post as a separate message
-        import asyncio
-        from datetime import datetime
-        
-        logger.info(f"Processing {len(posts)} posts for user {user_id}")
+        # Build a compact card per post; cards are packed into a few long messages
+        logger.debug("Processing %d posts for user %s", len(posts), user_id)
+        now_epoch = int(time.time())
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        cards = []
         for i, post in enumerate(posts):
-            logger.info(f"Processing post {i+1}/{len(posts)}: {post}")
-            post_id, content, category, timestamp, approved, comment_count, media_type, channel_message_id, flagged = post
+            if debug_enabled:
+                logger.debug("Processing post %d/%d: %r", i + 1, len(posts), post)
+            post_id, content, category, timestamp_epoch, approved, comment_count, media_type, channel_message_id, flagged = post
             
             # Format the status
             status = "✅ Approved" if approved == 1 else "❌ Rejected" if approved == 0 else "⏳ Pending"
@@ -126,15 +288,11 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
             if flagged == 1:
                 status += " 🚩"
             
-            # Format timestamp
-            try:
-                # Ensure timestamp is a string
-                timestamp_str = str(timestamp) if timestamp is not None else ""
-                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                time_ago = format_time_ago(dt)
-                escaped_time = escape_markdown_text(time_ago)
-            except:
-                escaped_time = escape_markdown_text("unknown time")
+            # Format timestamp; SQLite returns NULL epochs for unparseable values
+            if timestamp_epoch is not None:
+                escaped_time = escape_markdown_text(format_seconds_ago(now_epoch - timestamp_epoch))
+            else:
+                escaped_time = _UNKNOWN_TIME
             
             # Format post content (shortened preview)
             content_preview = truncate_text(content or "[Media content]", 150)
@@ -142,7 +300,7 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
             # Create post message
             post_text = (
                 f"*Post \\#{post_id}*\n"
-                f"*Category:* {escape_markdown_text(category)}\n"
+                f"*Category:* {_escape_category(category)}\n"
                 f"*Status:* {status}\n"
                 f"*Time:* {escaped_time}\n"
                 f"*Comments:* {comment_count}\n"
@@ -150,48 +308,34 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
                 f"*Content:*\n{escape_markdown_text(content_preview)}"
             )
             
-            # Create action buttons based on post status
-            keyboard = []
-            
+            # One row of action buttons per post, labelled with the post number
             # View button is always available
-            view_button = InlineKeyboardButton("👀 View Full Post", callback_data=f"view_post_{post_id}")
-            
-            # Delete button is available for all posts
-            delete_button = InlineKeyboardButton("🗑️ Delete Post", callback_data=f"admin_delete_post_{post_id}")
+            row = [InlineKeyboardButton(f"👀 #{post_id}", callback_data=f"view_post_{post_id}")]
             
             # For approved posts with channel messages, add view in channel button
             if approved == 1 and channel_message_id:
-                # Ensure CHANNEL_ID is a string for replace operation
-                channel_id_str = str(CHANNEL_ID).replace('-100', '')
-                keyboard.append([view_button, InlineKeyboardButton("📢 View in Channel", url=f"https://t.me/c/{channel_id_str}/{channel_message_id}")])
-            else:
-                keyboard.append([view_button])
+                row.append(InlineKeyboardButton("📢", url=f"https://t.me/c/{_CHANNEL_ID_STR}/{channel_message_id}"))
             
             # Add comment/moderation buttons
             if approved == 1:  # Approved posts
-                keyboard.append([
-                    InlineKeyboardButton(f"💬 Comments ({comment_count})", callback_data=f"see_comments_{post_id}_1"),
-                    delete_button
-                ])
+                row.append(InlineKeyboardButton(f"💬 {comment_count}", callback_data=f"see_comments_{post_id}_1"))
             elif approved is None:  # Pending posts
-                keyboard.append([
-                    InlineKeyboardButton("✅ Approve", callback_data=f"approve_{post_id}"),
-                    InlineKeyboardButton("❌ Reject", callback_data=f"reject_{post_id}")
-                ])
-                keyboard.append([delete_button])
-            else:  # Rejected posts
-                keyboard.append([delete_button])
+                row.append(InlineKeyboardButton("✅", callback_data=f"approve_{post_id}"))
+                row.append(InlineKeyboardButton("❌", callback_data=f"reject_{post_id}"))
             
-            # Send the post
+            # Delete button is available for all posts
+            row.append(InlineKeyboardButton("🗑️", callback_data=f"admin_delete_post_{post_id}"))
+            
+            cards.append((post_text, row))
+        
+        # Send the combined messages in order
+        for text, reply_markup in _combine_cards(cards):
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
-                text=post_text,
+                text=text,
                 parse_mode="MarkdownV2",
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=reply_markup
             )
-            
-            # Small delay between posts
-            await asyncio.sleep(0.3)
         
         # Send navigation buttons at the end
         nav_keyboard = [
@@ -200,8 +344,8 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
                 InlineKeyboardButton("💬 View Comments", callback_data=f"admin_user_comments_{user_id}")
             ],
             [
-                InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user"),
-                InlineKeyboardButton("🔧 Admin Dashboard", callback_data="admin_dashboard")
+                _BACK_TO_SEARCH_BUTTON,
+                _ADMIN_DASHBOARD_BUTTON
             ]
         ]
         
@@ -220,9 +364,7 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
                 chat_id=update.effective_chat.id,
                 text=f"❌ *Error*\n\nFailed to retrieve user posts: {escape_markdown_text(str(e))}",
                 parse_mode="MarkdownV2",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-                ]])
+                reply_markup=_BACK_TO_SEARCH_KB
             )
         except:
             # If we can't send a new message, try to edit the original
@@ -230,9 +372,7 @@ async def admin_user_posts_callback(update: Update, context: ContextTypes.DEFAUL
                 await query.edit_message_text(
                     f"❌ *Error*\n\nFailed to retrieve user posts: {escape_markdown_text(str(e))}",
                     parse_mode="MarkdownV2",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-                    ]])
+                    reply_markup=_BACK_TO_SEARCH_KB
                 )
             except:
                 logger.error("Failed to send error message in admin_user_posts_callback")
@@ -243,62 +383,30 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
     await query.answer()
     
     # Extract user ID from callback data
-    try:
-        # Ensure query.data is a string
-        callback_data = str(query.data) if query.data is not None else ""
-        user_id = int(callback_data.replace("admin_user_comments_", ""))
-    except (ValueError, AttributeError) as e:
-        logger.error(f"Invalid callback data for admin_user_comments_: {query.data}, error: {e}")
+    user_id = _parse_user_id(query.data, "admin_user_comments_")
+    if user_id is None:
+        logger.error(f"Invalid callback data for admin_user_comments_: {query.data}")
         await query.edit_message_text(
             "❌ *Invalid Request*\n\nThere was an error processing your request.",
             parse_mode="MarkdownV2",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-            ]])
+            reply_markup=_BACK_TO_SEARCH_KB
         )
         return
     
-    # Get comments by this user from the database
+    # Get comments by this user from the database without blocking the event loop
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get user info first
-            cursor.execute(
-                "SELECT username, first_name, last_name FROM users WHERE user_id = ?",
-                (user_id,)
+        user_data, comments = await asyncio.to_thread(_fetch_user_comments, user_id)
+        
+        if not user_data:
+            await query.edit_message_text(
+                "❌ *User Not Found*\n\nUnable to find user data.",
+                parse_mode="MarkdownV2",
+                reply_markup=_BACK_TO_SEARCH_KB
             )
-            user_data = cursor.fetchone()
-            
-            if not user_data:
-                await query.edit_message_text(
-                    "❌ *User Not Found*\n\nUnable to find user data.",
-                    parse_mode="MarkdownV2",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-                    ]])
-                )
-                return
-            
-            username, first_name, last_name = user_data
-            display_name = f"{first_name or ''} {last_name or ''}".strip() or username or "Anonymous"
-            
-            # Get all comments by this user
-            cursor.execute("""
-                SELECT 
-                    c.comment_id, c.post_id, c.content, c.timestamp, c.parent_comment_id, c.flagged,
-                    (SELECT COUNT(*) FROM reactions WHERE target_type = 'comment' AND target_id = c.comment_id AND reaction_type = 'like') as likes,
-                    (SELECT COUNT(*) FROM reactions WHERE target_type = 'comment' AND target_id = c.comment_id AND reaction_type = 'dislike') as dislikes,
-                    (SELECT COUNT(*) FROM comments WHERE parent_comment_id = c.comment_id) as reply_count,
-                    p.category as post_category
-                FROM comments c
-                LEFT JOIN posts p ON c.post_id = p.post_id
-                WHERE c.user_id = ?
-                ORDER BY c.timestamp DESC
-                LIMIT 25
-            """, (user_id,))
-            
-            comments = cursor.fetchall()
+            return
+        
+        username, first_name, last_name = user_data
+        display_name = f"{first_name or ''} {last_name or ''}".strip() or username or "Anonymous"
         
         if not comments:
             # No comments found
@@ -311,7 +419,7 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
                     InlineKeyboardButton("👤 User Info", callback_data=f"admin_user_info_{user_id}"),
                     InlineKeyboardButton("📝 View Posts", callback_data=f"admin_user_posts_{user_id}")
                 ], [
-                    InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
+                    _BACK_TO_SEARCH_BUTTON
                 ]])
             )
             return
@@ -334,12 +442,11 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
             parse_mode="MarkdownV2"
         )
         
-        # Send each comment as a separate message
-        import asyncio
-        from datetime import datetime
-        
+        # Build a compact card per comment; cards are packed into a few long messages
+        now_epoch = int(time.time())
+        cards = []
         for comment in comments:
-            comment_id, post_id, content, timestamp, parent_id, flagged, likes, dislikes, reply_count, post_category = comment
+            comment_id, post_id, content, timestamp_epoch, parent_id, flagged, likes, dislikes, reply_count, post_category = comment
             
             # Add flags if any
             status = "🚩 Flagged" if flagged == 1 else "✅ Normal"
@@ -347,15 +454,11 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
             # Is this a reply?
             is_reply = "✓" if parent_id else "✗"
             
-            # Format timestamp
-            try:
-                # Ensure timestamp is a string
-                timestamp_str = str(timestamp) if timestamp is not None else ""
-                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                time_ago = format_time_ago(dt)
-                escaped_time = escape_markdown_text(time_ago)
-            except:
-                escaped_time = escape_markdown_text("unknown time")
+            # Format timestamp; SQLite returns NULL epochs for unparseable values
+            if timestamp_epoch is not None:
+                escaped_time = escape_markdown_text(format_seconds_ago(now_epoch - timestamp_epoch))
+            else:
+                escaped_time = _UNKNOWN_TIME
             
             # Format comment content (shortened preview)
             content_preview = truncate_text(content, 200)
@@ -363,7 +466,7 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
             # Create comment message
             comment_text = (
                 f"*Comment \\#{comment_id}*\n"
-                f"*Post:* \\#{post_id} ({escape_markdown_text(post_category or 'Unknown')})\n"
+                f"*Post:* \\#{post_id} ({_escape_category(post_category or 'Unknown')})\n"
                 f"*Status:* {status}\n"
                 f"*Time:* {escaped_time}\n"
                 f"*Reactions:* 👍 {likes} | 👎 {dislikes}\n"
@@ -371,27 +474,23 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
                 f"*Content:*\n{escape_markdown_text(content_preview)}"
             )
             
-            # Create action buttons
-            keyboard = [
-                [
-                    InlineKeyboardButton("👀 View Post", callback_data=f"view_post_{post_id}"),
-                    InlineKeyboardButton("💬 See Thread", callback_data=f"see_comments_{post_id}_1")
-                ],
-                [
-                    InlineKeyboardButton("🗑️ Delete Comment", callback_data=f"admin_delete_comment_{comment_id}")
-                ]
+            # One row of action buttons per comment, labelled with the post and comment numbers
+            row = [
+                InlineKeyboardButton(f"👀 Post #{post_id}", callback_data=f"view_post_{post_id}"),
+                InlineKeyboardButton("💬 Thread", callback_data=f"see_comments_{post_id}_1"),
+                InlineKeyboardButton(f"🗑️ #{comment_id}", callback_data=f"admin_delete_comment_{comment_id}")
             ]
             
-            # Send the comment
+            cards.append((comment_text, row))
+        
+        # Send the combined messages in order
+        for text, reply_markup in _combine_cards(cards):
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
-                text=comment_text,
+                text=text,
                 parse_mode="MarkdownV2",
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=reply_markup
             )
-            
-            # Small delay between comments
-            await asyncio.sleep(0.3)
         
         # Send navigation buttons at the end
         nav_keyboard = [
@@ -400,8 +499,8 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
                 InlineKeyboardButton("📝 View Posts", callback_data=f"admin_user_posts_{user_id}")
             ],
             [
-                InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user"),
-                InlineKeyboardButton("🔧 Admin Dashboard", callback_data="admin_dashboard")
+                _BACK_TO_SEARCH_BUTTON,
+                _ADMIN_DASHBOARD_BUTTON
             ]
         ]
         
@@ -420,9 +519,7 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
                 chat_id=update.effective_chat.id,
                 text=f"❌ *Error*\n\nFailed to retrieve user comments: {escape_markdown_text(str(e))}",
                 parse_mode="MarkdownV2",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-                ]])
+                reply_markup=_BACK_TO_SEARCH_KB
             )
         except:
             # If we can't send a new message, try to edit the original
@@ -430,9 +527,7 @@ async def admin_user_comments_callback(update: Update, context: ContextTypes.DEF
                 await query.edit_message_text(
                     f"❌ *Error*\n\nFailed to retrieve user comments: {escape_markdown_text(str(e))}",
                     parse_mode="MarkdownV2",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("🔙 Back to User Search", callback_data="admin_search_user")
-                    ]])
+                    reply_markup=_BACK_TO_SEARCH_KB
                 )
             except:
                 logger.error("Failed to send error message in admin_user_comments_callback")
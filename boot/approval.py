@@ -1,80 +1,361 @@
-import sqlite3
+import asyncio
 import logging
+import time
+from functools import lru_cache
+from typing import Literal, NamedTuple, Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import ChatMigrated, Forbidden
 from telegram.ext import ContextTypes
-from config import ADMIN_IDS, CHANNEL_ID, BOT_USERNAME, DB_PATH
-from db import get_comment_count
+from config import ADMIN_IDS, CHANNEL_ID, BOT_USERNAME
+from db_connection import get_sqlite_pool
+from admin_user_activity import invalidate_user_activity_cache
 from submission import get_post_with_media, is_media_post, get_media_info, get_media_type_emoji
+from utils import escape_markdown_text, categories_to_hashtags
 
 # Import ranking system integration
 from ranking_integration import award_points_for_confession_approval, RankingIntegration
 
+# Blocked status changes rarely but is checked on almost every update,
+# so keep a short-lived per-process cache of it
+BLOCKED_CACHE_TTL = 60
+BLOCKED_CACHE_SIZE = 4096
+_blocked_cache = {}
+
+class PostRow(NamedTuple):
+    """The posts columns the moderation flow reads"""
+    post_id: int
+    content: Optional[str]
+    category: str
+    timestamp: str
+    user_id: int
+    approved: Optional[int]
+    post_number: Optional[int]
+
+# Categories and confession types come from small fixed sets, so their
+# MarkdownV2 escapes are worth remembering
+_escape_label = lru_cache(maxsize=256)(escape_markdown_text)
+
+def classify_post(post: Optional[PostRow]) -> Literal["pending", "approved", "rejected", "missing"]:
+    """Moderation state of a post row, so handlers can exit early once"""
+    if not post:
+        return "missing"
+    if post.approved == 1:
+        return "approved"
+    if post.approved == 0:
+        return "rejected"
+    return "pending"
+
+# Hot queries kept as constants so pooled connections reuse their
+# prepared statements
+_APPROVE_POST_SQL = "UPDATE posts SET approved=1, channel_message_id=?, post_number=? WHERE post_id=?"
+_GET_POST_BY_ID_SQL = (
+    "SELECT post_id, content, category, timestamp, user_id, approved, post_number "
+    "FROM posts WHERE post_id=?"
+)
+_IS_BLOCKED_SQL = "SELECT blocked FROM users WHERE user_id=?"
+
+def invalidate_blocked_cache(user_id=None):
+    """Drop cached blocked status for one user, or for everyone"""
+    if user_id is None:
+        _blocked_cache.clear()
+    else:
+        _blocked_cache.pop(user_id, None)
+
+# The channel's identity doesn't change, so one get_chat serves both the
+# access check and the link username for a while
+CHANNEL_CHAT_CACHE_TTL = 300
+_channel_chat_cache = {}
+
+async def get_channel_chat(bot):
+    """Get the channel's Chat, cached; raises if the channel is not accessible"""
+    now = time.monotonic()
+    cached = _channel_chat_cache.get(CHANNEL_ID)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    chat = await bot.get_chat(CHANNEL_ID)
+    _channel_chat_cache[CHANNEL_ID] = (now + CHANNEL_CHAT_CACHE_TTL, chat)
+    return chat
+
+def invalidate_channel_chat_cache():
+    """Forget the cached channel Chat, e.g. after losing access to it"""
+    _channel_chat_cache.clear()
+
 def approve_post(post_id, message_id, post_number):
     """Approve a post and save channel message ID with sequential post number"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE posts SET approved=1, channel_message_id=?, post_number=? WHERE post_id=?",
-            (message_id, post_number, post_id)
-        )
-        conn.commit()
+        cursor.execute(_APPROVE_POST_SQL, (message_id, post_number, post_id))
+    invalidate_user_activity_cache()
 
 def reject_post(post_id, rejection_reason=None):
     """Reject a post with optional rejection reason"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
         cursor.execute("UPDATE posts SET approved=0, rejection_reason=? WHERE post_id=?", (rejection_reason, post_id))
-        conn.commit()
+    invalidate_user_activity_cache()
 
-def get_next_post_number():
-    """Get the next sequential post number for approved posts"""
-    with sqlite3.connect(DB_PATH) as conn:
+def allocate_post_number():
+    """
+    Atomically reserve the next sequential post number for an approved post.
+    Bumps the post_number counter inside a single write transaction, so two
+    admins approving at the same time can never get the same number. A
+    missing counter row is seeded from the highest published number.
+    """
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT MAX(post_number) FROM posts WHERE post_number IS NOT NULL")
-        result = cursor.fetchone()
-        return (result[0] + 1) if result[0] is not None else 1
+        cursor.execute("""
+            INSERT INTO counters (name, value)
+            VALUES ('post_number', (SELECT COALESCE(MAX(post_number), 0) + 1 FROM posts))
+            ON CONFLICT(name) DO UPDATE SET value = value + 1
+            RETURNING value
+        """)
+        return cursor.fetchone()[0]
+
+def release_post_number(post_number):
+    """
+    Hand back a number from allocate_post_number when the post could not be
+    published. Only the latest number can be returned; if another approval
+    has reserved one since, the gap stays. Returns True if it was released.
+    """
+    with get_sqlite_pool().writer() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE counters SET value = value - 1 WHERE name = 'post_number' AND value = ?",
+            (post_number,)
+        )
+        return cursor.rowcount > 0
 
 def flag_post(post_id):
     """Flag a post for review"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
         cursor.execute("UPDATE posts SET flagged=1 WHERE post_id=?", (post_id,))
-        conn.commit()
 
 def block_user(user_id):
     """Block a user"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
         cursor.execute("UPDATE users SET blocked=1 WHERE user_id=?", (user_id,))
-        conn.commit()
+    invalidate_blocked_cache(user_id)
 
 def unblock_user(user_id):
     """Unblock a user"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
         cursor.execute("UPDATE users SET blocked=0 WHERE user_id=?", (user_id,))
-        conn.commit()
+    invalidate_blocked_cache(user_id)
+
+def fetch_approval_bundle(post_id):
+    """
+    Load everything the approve flow needs in a single query: the post as a
+    PostRow, its comment count and its media info (or None).
+    Returns None if the post does not exist.
+    """
+    with get_sqlite_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT p.post_id, p.content, p.category, p.timestamp, p.user_id,
+                   p.approved, p.post_number,
+                   p.media_type, p.media_file_id, p.media_file_unique_id, p.media_caption,
+                   p.media_file_size, p.media_mime_type, p.media_duration,
+                   p.media_width, p.media_height, p.media_thumbnail_file_id,
+                   (SELECT COUNT(*) FROM comments WHERE post_id = p.post_id)
+            FROM posts p
+            WHERE p.post_id = ?
+        """, (post_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+    
+    post = PostRow(*row[:7])
+    media = row[7:17]
+    comment_count = row[17]
+    
+    media_info = None
+    if media[0]:
+        media_info = {
+            'type': media[0],
+            'file_id': media[1],
+            'file_unique_id': media[2],
+            'caption': media[3],
+            'file_size': media[4],
+            'mime_type': media[5],
+            'duration': media[6],
+            'width': media[7],
+            'height': media[8],
+            'thumbnail_file_id': media[9]
+        }
+    
+    return post, comment_count, media_info
 
 def get_post_by_id(post_id):
     """Get a specific post by ID"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM posts WHERE post_id=?", (post_id,))
-        return cursor.fetchone()
+        cursor.execute(_GET_POST_BY_ID_SQL, (post_id,))
+        row = cursor.fetchone()
+        return PostRow(*row) if row else None
 
 def is_blocked_user(user_id):
     """Check if user is blocked"""
-    with sqlite3.connect(DB_PATH) as conn:
+    now = time.monotonic()
+    cached = _blocked_cache.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT blocked FROM users WHERE user_id=?", (user_id,))
+        cursor.execute(_IS_BLOCKED_SQL, (user_id,))
         result = cursor.fetchone()
-        return result and result[0] == 1
+        blocked = bool(result and result[0] == 1)
+    
+    if len(_blocked_cache) >= BLOCKED_CACHE_SIZE:
+        _blocked_cache.clear()
+    _blocked_cache[user_id] = (now + BLOCKED_CACHE_TTL, blocked)
+    return blocked
 
-async def handle_final_rejection(update: Update, context: ContextTypes.DEFAULT_TYPE, post_id: int, rejection_reason: str):
+def _spawn_background(context, coro):
+    """Run a fire-and-forget side effect without holding up the handler"""
+    # Keep a reference so pending tasks aren't garbage collected
+    tasks = context.application.bot_data.setdefault('background_tasks', set())
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+    task.add_done_callback(_log_background_failure)
+    return task
+
+def _log_background_failure(task):
+    """Log errors from background side effects instead of dropping them"""
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Background task failed: {task.exception()}")
+
+async def _notify_submitter_rejected(bot, submitter_id, post_id, category, rejection_reason):
+    """Tell the submitter their confession was rejected and why"""
+    try:
+        # Determine if this is a media post
+        confession_type = "confession"
+        media_info = await asyncio.to_thread(get_media_info, post_id)
+        if media_info:
+            media_type_name = media_info['type'].title()
+            emoji = get_media_type_emoji(media_info['type'])
+            confession_type = f"{emoji} {media_type_name} confession"
+        
+        # Build notification message with reason
+        message_text = f"""
+❌ *{confession_type.title()} Rejected*
+
+Your {_escape_label(confession_type)} in category `{_escape_label(category)}` was not approved for the following reason:
+
+💬 *Admin feedback:*
+_{escape_markdown_text(rejection_reason)}_
+
+📝 *What's next?*
+You can review the feedback and submit a new confession that addresses the concerns mentioned above\\.
+
+🌟 *Thank you for your understanding\\!*
+"""
+        
+        # Create keyboard with helpful buttons
+        keyboard = [
+            [InlineKeyboardButton("🆕 Submit New Confession", callback_data="start_confession")],
+            [InlineKeyboardButton("📞 Contact Admin", callback_data="contact_admin")],
+            [InlineKeyboardButton("🏠 Main Menu", callback_data="menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        # Send notification
+        await bot.send_message(
+            chat_id=submitter_id,
+            text=message_text,
+            parse_mode="MarkdownV2",
+            reply_markup=reply_markup
+        )
+    except Exception as e:
+        logging.warning(f"Could not notify user {submitter_id} about rejection: {e}")
+
+async def _notify_submitter_approved(bot, submitter_id, category, post_number, media_info, msg):
+    """Tell the submitter their confession was approved, with a channel link"""
+    try:
+        # Determine confession type for notification
+        confession_type = "confession"
+        if media_info:
+            media_type_name = media_info['type'].title()
+            emoji = get_media_type_emoji(media_info['type'])
+            confession_type = f"{emoji} {media_type_name} confession"
+        
+        # Generate proper channel link if possible
+        channel_link_text = "Check the channel"  # Default fallback
+        if msg:
+            try:
+                if CHANNEL_ID < 0:
+                    # Private channel - use c/ format
+                    # Remove the -100 prefix that Telegram adds to supergroups
+                    channel_link_id = str(CHANNEL_ID)[4:] if str(CHANNEL_ID).startswith('-100') else str(abs(CHANNEL_ID))
+                    channel_link_text = f"[View in Channel](https://t.me/c/{channel_link_id}/{msg.message_id})"
+                else:
+                    # Public channel - try to get username
+                    try:
+                        chat = await get_channel_chat(bot)
+                        if hasattr(chat, 'username') and chat.username:
+                            channel_link_text = f"[View in Channel](https://t.me/{chat.username}/{msg.message_id})"
+                        else:
+                            # Public channel but no username available
+                            channel_link_text = f"[View in Channel](https://t.me/c/{CHANNEL_ID}/{msg.message_id})"
+                    except Exception as e:
+                        logging.warning(f"Could not get channel info for link: {e}")
+                        channel_link_text = f"[View in Channel](https://t.me/c/{CHANNEL_ID}/{msg.message_id})"
+            except Exception as e:
+                logging.warning(f"Error generating channel link: {e}")
+                channel_link_text = "Check the channel"
+        
+        # Build the notification message with proper escaping
+        message_text = f"""
+✅ *{confession_type.title()} Approved\\!*
+
+Your {_escape_label(confession_type)} in category `{_escape_label(category)}` has been approved and posted to the channel\\!
+
+🔢 *Post Number:* \\#{post_number}
+
+💡 {channel_link_text}
+
+🌟 *Thank you for sharing with us\\!*
+"""
+        
+        # Create keyboard with helpful buttons
+        keyboard = [
+            [InlineKeyboardButton("🆕 Submit New Confession", callback_data="start_confession")],
+            [InlineKeyboardButton("📋 View My Stats", callback_data="my_stats")],
+            [InlineKeyboardButton("🏠 Main Menu", callback_data="menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        # Send notification with proper formatting
+        await bot.send_message(
+            chat_id=submitter_id,
+            text=message_text,
+            parse_mode="MarkdownV2",
+            reply_markup=reply_markup,
+            disable_web_page_preview=False
+        )
+    except Exception as e:
+        logging.warning(f"Could not notify user {submitter_id}: {e}")
+
+def _rejecting_post(context, post_id):
+    """The post stashed by the reject_ step, if it is the one being rejected"""
+    post = context.user_data.get('admin_rejecting_post')
+    if post is not None and post.post_id == post_id:
+        return post
+    return None
+
+async def handle_final_rejection(update: Update, context: ContextTypes.DEFAULT_TYPE, post_id: int, rejection_reason: str, *, post=None):
     """Handle the final rejection process with reason"""
     try:
-        # Get post details
-        post = get_post_by_id(post_id)
+        # Get post details, reusing the row fetched by the reject_ step
+        if post is None:
+            post = _rejecting_post(context, post_id)
+        if post is None:
+            post = await asyncio.to_thread(get_post_by_id, post_id)
         if not post:
             if update.callback_query:
                 await update.callback_query.edit_message_text("❗ Post not found.")
@@ -83,16 +364,17 @@ async def handle_final_rejection(update: Update, context: ContextTypes.DEFAULT_T
             return
         
         # Get submitter info
-        submitter_id = post[4]  # user_id is at index 4
-        category = post[2]  # category is at index 2
+        submitter_id = post.user_id
+        category = post.category
         
         # Reject the post with reason
-        reject_post(post_id, rejection_reason)
+        await asyncio.to_thread(reject_post, post_id, rejection_reason)
         
         # Clear admin state
         context.user_data.pop('admin_rejecting_post_id', None)
         context.user_data.pop('admin_rejecting_submitter_id', None)
         context.user_data.pop('admin_rejecting_category', None)
+        context.user_data.pop('admin_rejecting_post', None)
         context.user_data.pop('state', None)
         
         # Update admin interface
@@ -116,56 +398,12 @@ async def handle_final_rejection(update: Update, context: ContextTypes.DEFAULT_T
         if update and update.effective_user:
             admin_id = update.effective_user.id
         
-        # Deduct points for rejected confession
+        # Deduct points and notify the submitter in the background so the
+        # admin can move on to the next submission
         if admin_id is not None:
-            await RankingIntegration.handle_confession_rejected(submitter_id, post_id, admin_id)
-        
-        # Notify the submitter with rejection reason
+            _spawn_background(context, RankingIntegration.handle_confession_rejected(submitter_id, post_id, admin_id))
         if submitter_id:
-            try:
-                # Import escape function for proper markdown formatting
-                from utils import escape_markdown_text
-                
-                # Determine if this is a media post
-                confession_type = "confession"
-                media_info = get_media_info(post_id)
-                if media_info:
-                    media_type_name = media_info['type'].title()
-                    emoji = get_media_type_emoji(media_info['type'])
-                    confession_type = f"{emoji} {media_type_name} confession"
-                
-                # Build notification message with reason
-                message_text = f"""
-❌ *{confession_type.title()} Rejected*
-
-Your {escape_markdown_text(confession_type)} in category `{escape_markdown_text(category)}` was not approved for the following reason:
-
-💬 *Admin feedback:*
-_{escape_markdown_text(rejection_reason)}_
-
-📝 *What's next?*
-You can review the feedback and submit a new confession that addresses the concerns mentioned above\\.
-
-🌟 *Thank you for your understanding\\!*
-"""
-                
-                # Create keyboard with helpful buttons
-                keyboard = [
-                    [InlineKeyboardButton("🆕 Submit New Confession", callback_data="start_confession")],
-                    [InlineKeyboardButton("📞 Contact Admin", callback_data="contact_admin")],
-                    [InlineKeyboardButton("🏠 Main Menu", callback_data="menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                # Send notification
-                await context.bot.send_message(
-                    chat_id=submitter_id,
-                    text=message_text,
-                    parse_mode="MarkdownV2",
-                    reply_markup=reply_markup
-                )
-            except Exception as e:
-                logging.warning(f"Could not notify user {submitter_id} about rejection: {e}")
+            _spawn_background(context, _notify_submitter_rejected(context.bot, submitter_id, post_id, category, rejection_reason))
                 
     except Exception as e:
         logging.error(f"Error in handle_final_rejection: {e}")
@@ -220,498 +458,467 @@ async def handle_admin_rejection_reason_input(update: Update, context: ContextTy
         f"**Reason:** {rejection_reason}"
     )
 
-async def admin_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle admin approval/rejection callbacks"""
-    if not update or not update.callback_query:
+async def _approve_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Approve a submission and publish it to the channel"""
+    post_id = int(data.split("_")[1])
+    # Post, comment count and media in one round-trip
+    bundle = await asyncio.to_thread(fetch_approval_bundle, post_id)
+    post, comment_count, media_info = bundle if bundle else (None, 0, None)
+    state = classify_post(post)
+    if state == "missing":
+        try:
+            await query.edit_message_text("❗ Post not found.")
+        except:
+            pass
         return
     
-    query = update.callback_query
-    await query.answer()
-    
-    if not query or not query.data:
+    # Check if post is already approved (prevent duplicate approvals)
+    if state == "approved":
+        try:
+            await query.edit_message_text(
+                "✅ Approved by another admin\\!\n\n"
+                "This post was already approved by a different admin\\. "
+                "You can still view it in the channel\\.",
+                parse_mode="MarkdownV2"
+            )
+        except:
+            pass
         return
     
-    data = query.data
-    admin_id = None
-    if update and update.effective_user:
-        admin_id = update.effective_user.id
-    
-    if admin_id not in ADMIN_IDS:
+    # Check if post is already rejected
+    if state == "rejected":
         try:
-            await query.edit_message_text("❗ You are not authorized to moderate.")
+            await query.edit_message_text(
+                "❌ Already rejected\\!\n\n"
+                "This post was already rejected by a different admin\\. "
+                "No further action is needed\\.",
+                parse_mode="MarkdownV2"
+            )
         except:
             pass
         return
-
-    if data.startswith("approve_"):
-        post_id = int(data.split("_")[1])
-        post = get_post_by_id(post_id)
-        if not post:
-            try:
-                await query.edit_message_text("❗ Post not found.")
-            except:
-                pass
-            return
+    
+    # Get submitter info
+    submitter_id = post.user_id
+    category = post.category
+    
+    # Initialize post_number to None
+    post_number = None
+    msg = None
+    approved = False
+    
+    try:
+        # Reserve the next sequential post number
+        post_number = await asyncio.to_thread(allocate_post_number)
         
-        # Check if post is already approved (prevent duplicate approvals)
-        # Use safe indexing to avoid index out of range errors
-        if len(post) > 5 and post[5] == 1:  # approved field is at index 5
-            try:
-                await query.edit_message_text(
-                    "✅ Approved by another admin\\!\n\n"
-                    "This post was already approved by a different admin\\. "
-                    "You can still view it in the channel\\.",
-                    parse_mode="MarkdownV2"
+        # Create inline buttons for the channel post
+        bot_username_clean = BOT_USERNAME.lstrip('@')
+        keyboard = [
+            [
+                InlineKeyboardButton(
+                    "💬 Add Comment", 
+                    url=f"https://t.me/{bot_username_clean}?start=comment_{post_id}"
                 )
-            except:
-                pass
-            return
-        
-        # Check if post is already rejected
-        if len(post) > 5 and post[5] == 0:  # approved field is at index 5
-            try:
-                await query.edit_message_text(
-                    "❌ Already rejected\\!\n\n"
-                    "This post was already rejected by a different admin\\. "
-                    "No further action is needed\\.",
-                    parse_mode="MarkdownV2"
+            ],
+            [
+                InlineKeyboardButton(
+                    f"👀 See Comments ({comment_count})", 
+                    url=f"https://t.me/{bot_username_clean}?start=view_{post_id}"
                 )
-            except:
-                pass
-            return
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
         
-        # Get submitter info
-        submitter_id = post[4]  # user_id is at index 4
-        category = post[2]  # category is at index 2
+        # Test channel access first
+        try:
+            # Try to get channel info to verify access
+            await get_channel_chat(context.bot)
+            channel_accessible = True
+        except Exception as e:
+            logging.warning(f"Channel {CHANNEL_ID} not accessible: {e}")
+            channel_accessible = False
         
-        # Initialize post_number to None
-        post_number = None
+        # Convert categories into hashtags
+        categories_text = categories_to_hashtags(post.category)
         
-        try:
-            # Get the next sequential post number
-            post_number = get_next_post_number()
-            
-            # Get current comment count
-            comment_count = get_comment_count(post_id)
-            
-            # Create inline buttons for the channel post
-            bot_username_clean = BOT_USERNAME.lstrip('@')
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        "💬 Add Comment", 
-                        url=f"https://t.me/{bot_username_clean}?start=comment_{post_id}"
+        # Check if this is a media post
+        is_media = bool(media_info)
+        
+        # Award points for approved confession
+        submitter_id = post.user_id
+        
+        # Try to post to the channel only if accessible
+        # Initialize variables
+        content = post.content
+        channel_post_successful = False
+        
+        if channel_accessible:
+            # Check if this is a media post
+            if is_media and media_info:
+                # Prepare caption with post number, text content, and hashtags
+                caption_text = f"<b>Confess # {post_number}</b>\n\n"
+                
+                # Add text content if available
+                if content and content.strip():
+                    caption_text += f"{content}\n\n"
+                
+                # Add media caption if available and different from main content
+                if media_info.get('caption') and media_info['caption'] != content:
+                    caption_text += f"{media_info['caption']}\n\n"
+                
+                # Add hashtags
+                caption_text += categories_text
+                
+                # Send media message based on type
+                if media_info['type'] == 'photo':
+                    msg = await context.bot.send_photo(
+                        chat_id=CHANNEL_ID,
+                        photo=media_info['file_id'],
+                        caption=caption_text,
+                        parse_mode="HTML",
+                        reply_markup=reply_markup
                     )
-                ],
-                [
-                    InlineKeyboardButton(
-                        f"👀 See Comments ({comment_count})", 
-                        url=f"https://t.me/{bot_username_clean}?start=view_{post_id}"
+                elif media_info['type'] == 'video':
+                    msg = await context.bot.send_video(
+                        chat_id=CHANNEL_ID,
+                        video=media_info['file_id'],
+                        caption=caption_text,
+                        parse_mode="HTML",
+                        reply_markup=reply_markup
+                    )
+                elif media_info['type'] == 'animation':
+                    msg = await context.bot.send_animation(
+                        chat_id=CHANNEL_ID,
+                        animation=media_info['file_id'],
+                        caption=caption_text,
+                        parse_mode="HTML",
+                        reply_markup=reply_markup
                     )
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Test channel access first
-            try:
-                # Try to get channel info to verify access
-                await context.bot.get_chat(CHANNEL_ID)
-                channel_accessible = True
-            except Exception as e:
-                logging.warning(f"Channel {CHANNEL_ID} not accessible: {e}")
-                channel_accessible = False
-            
-            # Convert categories into hashtags
-            categories = post[2]  # category is at index 2
-            # Create the category hashtags
-            categories_text = " ".join(
-                [f"#{cat.strip().replace(' ', '')}" for cat in categories.split(",")]
-            )
-            
-            # Check if this is a media post
-            is_media = False
-            media_info = None
-            
-            # Get media information
-            media_info = get_media_info(post_id)
-            if media_info:
-                is_media = True
-            
-            # Award points for approved confession
-            submitter_id = post[4]  # user_id is at index 4
-            
-            # Try to post to the channel only if accessible
-            # Initialize variables
-            content = post[1]  # content is at index 1
-            msg = None
-            channel_post_successful = False
-            
-            if channel_accessible:
-                # Check if this is a media post
-                if is_media and media_info:
-                    # Prepare caption with post number, text content, and hashtags
-                    caption_text = f"<b>Confess # {post_number}</b>\n\n"
-                    
-                    # Add text content if available
-                    if content and content.strip():
-                        caption_text += f"{content}\n\n"
-                    
-                    # Add media caption if available and different from main content
-                    if media_info.get('caption') and media_info['caption'] != content:
-                        caption_text += f"{media_info['caption']}\n\n"
-                    
-                    # Add hashtags
-                    caption_text += categories_text
-                    
-                    # Send media message based on type
-                    if media_info['type'] == 'photo':
-                        msg = await context.bot.send_photo(
-                            chat_id=CHANNEL_ID,
-                            photo=media_info['file_id'],
-                            caption=caption_text,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    elif media_info['type'] == 'video':
-                        msg = await context.bot.send_video(
-                            chat_id=CHANNEL_ID,
-                            video=media_info['file_id'],
-                            caption=caption_text,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    elif media_info['type'] == 'animation':
-                        msg = await context.bot.send_animation(
-                            chat_id=CHANNEL_ID,
-                            animation=media_info['file_id'],
-                            caption=caption_text,
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
-                    else:
-                        # Fallback to text message if media type is not supported
-                        msg = await context.bot.send_message(
-                            chat_id=CHANNEL_ID,
-                            text=f"<b>Confess # {post_number}</b>\n\n"
-                                f"<i>[Media type '{media_info['type']}' not supported]</i>\n\n"
-                                f"{content}\n\n"
-                                f"{categories_text}",
-                            parse_mode="HTML",
-                            reply_markup=reply_markup
-                        )
                 else:
-                    # Text-only post
+                    # Fallback to text message if media type is not supported
                     msg = await context.bot.send_message(
                         chat_id=CHANNEL_ID,
                         text=f"<b>Confess # {post_number}</b>\n\n"
+                            f"<i>[Media type '{media_info['type']}' not supported]</i>\n\n"
                             f"{content}\n\n"
                             f"{categories_text}",
                         parse_mode="HTML",
                         reply_markup=reply_markup
                     )
-                    
-                if msg:
-                    channel_post_successful = True
-                    
-            # Handle case where channel is not accessible
-            if not channel_accessible:
-                logging.warning(f"Channel not accessible, approving post {post_id} without posting to channel")
-                # Still approve the post in database without channel message ID
-                approve_post(post_id, None, post_number)
-            
-            # Update the post with the channel message ID and post number
+            else:
+                # Text-only post
+                msg = await context.bot.send_message(
+                    chat_id=CHANNEL_ID,
+                    text=f"<b>Confess # {post_number}</b>\n\n"
+                        f"{content}\n\n"
+                        f"{categories_text}",
+                    parse_mode="HTML",
+                    reply_markup=reply_markup
+                )
+                
             if msg:
-                approve_post(post_id, msg.message_id, post_number)
+                channel_post_successful = True
                 
-            try:
-                if channel_accessible and msg:
-                    await query.edit_message_text(f"✅ Approved and posted to channel as Post #{post_number}.")
-                elif channel_accessible and not msg:
-                    await query.edit_message_text(f"✅ Approved as Post #{post_number}, but failed to post to channel.")
-                else:
-                    await query.edit_message_text(f"✅ Approved as Post #{post_number}. (Channel not accessible - post saved locally)")
-            except:
-                pass
-            
-            # Award points for approved confession
-            if admin_id is not None:
-                await award_points_for_confession_approval(submitter_id, post_id, admin_id, context)
+        # Handle case where channel is not accessible
+        if not channel_accessible:
+            logging.warning(f"Channel not accessible, approving post {post_id} without posting to channel")
+            # Still approve the post in database without channel message ID
+            await asyncio.to_thread(approve_post, post_id, None, post_number)
+            approved = True
+        
+        # Update the post with the channel message ID and post number
+        if msg:
+            await asyncio.to_thread(approve_post, post_id, msg.message_id, post_number)
+            approved = True
             
-            # Notify the submitter with media support
-            if submitter_id:
-                try:
-                    # Import escape function for proper markdown formatting
-                    from utils import escape_markdown_text
-                    
-                    # Determine confession type for notification
-                    confession_type = "confession"
-                    if is_media and media_info:
-                        media_type_name = media_info['type'].title()
-                        emoji = get_media_type_emoji(media_info['type'])
-                        confession_type = f"{emoji} {media_type_name} confession"
-                    
-                    # Generate proper channel link if possible
-                    channel_link_text = "Check the channel"  # Default fallback
-                    if msg:
-                        try:
-                            if CHANNEL_ID < 0:
-                                # Private channel - use c/ format
-                                # Remove the -100 prefix that Telegram adds to supergroups
-                                channel_link_id = str(CHANNEL_ID)[4:] if str(CHANNEL_ID).startswith('-100') else str(abs(CHANNEL_ID))
-                                channel_link_text = f"[View in Channel](https://t.me/c/{channel_link_id}/{msg.message_id})"
-                            else:
-                                # Public channel - try to get username
-                                try:
-                                    chat = await context.bot.get_chat(CHANNEL_ID)
-                                    if hasattr(chat, 'username') and chat.username:
-                                        channel_link_text = f"[View in Channel](https://t.me/{chat.username}/{msg.message_id})"
-                                    else:
-                                        # Public channel but no username available
-                                        channel_link_text = f"[View in Channel](https://t.me/c/{CHANNEL_ID}/{msg.message_id})"
-                                except Exception as e:
-                                    logging.warning(f"Could not get channel info for link: {e}")
-                                    channel_link_text = f"[View in Channel](https://t.me/c/{CHANNEL_ID}/{msg.message_id})"
-                        except Exception as e:
-                            logging.warning(f"Error generating channel link: {e}")
-                            channel_link_text = "Check the channel"
-                    
-                    # Build the notification message with proper escaping
-                    message_text = f"""
-✅ *{confession_type.title()} Approved\\!*
-
-Your {escape_markdown_text(confession_type)} in category `{escape_markdown_text(category)}` has been approved and posted to the channel\\!
-
-🔢 *Post Number:* \\#{post_number}
-
-💡 {channel_link_text}
-
-🌟 *Thank you for sharing with us\\!*
-"""
-                    
-                    # Create keyboard with helpful buttons
-                    keyboard = [
-                        [InlineKeyboardButton("🆕 Submit New Confession", callback_data="start_confession")],
-                        [InlineKeyboardButton("📋 View My Stats", callback_data="my_stats")],
-                        [InlineKeyboardButton("🏠 Main Menu", callback_data="menu")]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    
-                    # Send notification with proper formatting
-                    await context.bot.send_message(
-                        chat_id=submitter_id,
-                        text=message_text,
-                        parse_mode="MarkdownV2",
-                        reply_markup=reply_markup,
-                        disable_web_page_preview=False
-                    )
-                except Exception as e:
-                    logging.warning(f"Could not notify user {submitter_id}: {e}")
-                    
-        except Exception as e:
-            logging.error(f"Failed to post to channel: {e}")
-            try:
-                await query.edit_message_text(f"❗ Failed to post to channel: {e}")
-            except:
-                pass
-
-    elif data.startswith("reject_"):
-        # Get post details
-        post_id = int(data.split("_")[1])
-        post = get_post_by_id(post_id)
-        if not post:
-            try:
-                await query.edit_message_text("❗ Post not found.")
-            except:
-                pass
-            return
+        try:
+            if channel_accessible and msg:
+                await query.edit_message_text(f"✅ Approved and posted to channel as Post #{post_number}.")
+            elif channel_accessible and not msg:
+                await query.edit_message_text(f"✅ Approved as Post #{post_number}, but failed to post to channel.")
+            else:
+                await query.edit_message_text(f"✅ Approved as Post #{post_number}. (Channel not accessible - post saved locally)")
+        except:
+            pass
         
-        # Check if post is already rejected (prevent duplicate rejections)
-        # Use safe indexing to avoid index out of range errors
-        if len(post) > 5 and post[5] == 0:  # approved field is at index 5
-            try:
-                # Get post number if it exists
-                post_number = None
-                try:
-                    post_number = get_next_post_number()
-                except:
-                    pass
+        # Award points and notify the submitter in the background so the
+        # admin can move on to the next submission
+        if admin_id is not None:
+            _spawn_background(context, award_points_for_confession_approval(submitter_id, post_id, admin_id, context))
+        if submitter_id:
+            _spawn_background(context, _notify_submitter_approved(context.bot, submitter_id, category, post_number, media_info, msg))
                 
-                await query.edit_message_text(
-                    f"❌ This post has already been rejected by another admin\\. \nYou can still view it in the channel as post #{post_number if post_number is not None else 'unknown'}\\.",
-                    parse_mode="MarkdownV2"
-                )
-            except:
-                pass
-            return
-
-        # Check if post is already approved
-        if len(post) > 5 and post[5] == 1:  # approved field is at index 5
+    except Exception as e:
+        logging.error(f"Failed to post to channel: {e}")
+        # Nothing went public and the post is still pending, so don't
+        # leave a gap in the channel's numbering
+        if post_number is not None and msg is None and not approved:
             try:
-                # Get post number if it exists
-                post_number = None
-                try:
-                    post_number = get_next_post_number()
-                except:
-                    pass
-                
-                await query.edit_message_text(
-                    f"✅ Already approved by another admin\\!\n\nThis post was already approved and posted to the channel as post #{post_number if post_number is not None else 'unknown'}\\.",
-                    parse_mode="MarkdownV2"
-                )
-            except:
-                pass
-            return
-        
-        # Get submitter info
-        submitter_id = post[4]  # user_id is at index 4
-        category = post[2]  # category is at index 2
-        
-        # Start rejection reason flow - ask admin for reason
-        context.user_data['admin_rejecting_post_id'] = post_id
-        context.user_data['admin_rejecting_submitter_id'] = submitter_id
-        context.user_data['admin_rejecting_category'] = category
-        context.user_data['state'] = 'admin_providing_rejection_reason'
-        
-        # Create keyboard with quick reason options and custom option
-        # Use short callback data to avoid Telegram's 64-byte limit
-        quick_reasons = [
-            [InlineKeyboardButton("❌ Inappropriate Content", callback_data=f"qreject_{post_id}_1")],
-            [InlineKeyboardButton("📝 Incomplete/Unclear", callback_data=f"qreject_{post_id}_2")],
-            [InlineKeyboardButton("🔁 Duplicate Content", callback_data=f"qreject_{post_id}_3")],
-            [InlineKeyboardButton("⚠️ Spam/Low Quality", callback_data=f"qreject_{post_id}_4")],
-            [InlineKeyboardButton("✏️ Write Custom Reason", callback_data=f"custom_reject_{post_id}")],
-            [InlineKeyboardButton("🚫 Cancel Rejection", callback_data=f"cancel_reject_{post_id}")]
-        ]
-        reply_markup = InlineKeyboardMarkup(quick_reasons)
-        
+                await asyncio.to_thread(release_post_number, post_number)
+            except Exception as release_error:
+                logging.warning(f"Could not release post number {post_number}: {release_error}")
+        if isinstance(e, (ChatMigrated, Forbidden)):
+            # The cached channel Chat is stale; look it up again next time
+            invalidate_channel_chat_cache()
         try:
-            await query.edit_message_text(
-                "📝 *Please provide a reason for rejection:*\n\n"
-                "Choose a quick reason below or select 'Write Custom Reason' to provide your own specific feedback\\.",
-                reply_markup=reply_markup,
-                parse_mode="MarkdownV2"
-            )
-        except Exception as e:
-            logging.error(f"Error showing rejection reason options: {e}")
-            # Fallback to direct rejection if UI fails
-            reject_post(post_id, "Rejected by admin")
-            try:
-                await query.edit_message_text("❌ Submission rejected.")
-            except:
-                pass
-    
-    elif data.startswith("qreject_"):
-        # Handle quick rejection with predefined reason using short callback data
-        parts = data.split("_")  # qreject_postid_reasoncode
-        if len(parts) < 3:
-            return
-        
-        post_id = int(parts[1])  # Extract post_id
-        reason_code = parts[2]   # Extract reason code
-        
-        # Map reason codes to full rejection messages
-        reason_map = {
-            "1": "Inappropriate content - violates community guidelines",
-            "2": "Incomplete or unclear submission", 
-            "3": "Duplicate or repetitive content",
-            "4": "Spam or low quality content"
-        }
-        
-        rejection_reason = reason_map.get(reason_code, "Rejected by admin")
-        
-        await handle_final_rejection(update, context, post_id, rejection_reason)
+            await query.edit_message_text(f"❗ Failed to post to channel: {e}")
+        except:
+            pass
+
+
+async def _reject_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Start the rejection flow by asking the admin for a reason"""
+    # Get post details
+    post_id = int(data.split("_")[1])
+    post = await asyncio.to_thread(get_post_by_id, post_id)
+    state = classify_post(post)
+    if state == "missing":
+        try:
+            await query.edit_message_text("❗ Post not found.")
+        except:
+            pass
+        return
     
-    elif data.startswith("custom_reject_"):
-        # Handle custom rejection reason request
-        post_id = int(data.split("_")[2])
-        context.user_data['admin_rejecting_post_id'] = post_id
-        context.user_data['state'] = 'admin_writing_rejection_reason'
-        
-        # Create cancel button
-        cancel_keyboard = [[InlineKeyboardButton("🚫 Cancel", callback_data=f"cancel_reject_{post_id}")]]
-        cancel_reply_markup = InlineKeyboardMarkup(cancel_keyboard)
-        
+    # Check if post is already rejected (prevent duplicate rejections)
+    if state == "rejected":
         try:
+            # Post number it was published under, if any
+            post_number = post.post_number
+            
             await query.edit_message_text(
-                "✏️ *Please type your custom rejection reason:*\n\n"
-                "Provide specific feedback to help the user understand why their submission was rejected\\. "
-                "Be constructive and helpful in your explanation\\.",
-                reply_markup=cancel_reply_markup,
+                f"❌ This post has already been rejected by another admin\\. \nYou can still view it in the channel as post #{post_number if post_number is not None else 'unknown'}\\.",
                 parse_mode="MarkdownV2"
             )
-        except Exception as e:
-            logging.error(f"Error requesting custom rejection reason: {e}")
-    
-    elif data.startswith("cancel_reject_"):
-        # Handle cancellation of rejection
-        post_id = int(data.split("_")[2])
-        
-        # Get post details to access user_id
-        post = get_post_by_id(post_id)
-        if not post:
-            try:
-                await query.edit_message_text("❗ Post not found.")
-            except:
-                pass
-            return
-        
-        # Clear rejection state
-        context.user_data.pop('admin_rejecting_post_id', None)
-        context.user_data.pop('admin_rejecting_submitter_id', None)
-        context.user_data.pop('admin_rejecting_category', None)
-        context.user_data.pop('state', None)
-        
-        # Restore original admin panel for this post
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Approve", callback_data=f"approve_{post_id}"),
-                InlineKeyboardButton("❌ Reject", callback_data=f"reject_{post_id}")
-            ],
-            [
-                InlineKeyboardButton("🚩 Flag", callback_data=f"flag_{post_id}"),
-                InlineKeyboardButton("⛔ Block User", callback_data=f"block_{post[4]}")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
+        except:
+            pass
+        return
+
+    # Check if post is already approved
+    if state == "approved":
         try:
+            # Post number it was published under, if any
+            post_number = post.post_number
+            
             await query.edit_message_text(
-                "🔄 *Rejection cancelled\\.*\n\n"
-                "Please choose an action for this submission\\:",
-                reply_markup=reply_markup,
+                f"✅ Already approved by another admin\\!\n\nThis post was already approved and posted to the channel as post #{post_number if post_number is not None else 'unknown'}\\.",
                 parse_mode="MarkdownV2"
             )
-        except Exception as e:
-            logging.error(f"Error cancelling rejection: {e}")
-
-    elif data.startswith("flag_"):
-        # Handle flagging
-        post_id = int(data.split("_")[1])
-        flag_post(post_id)
-        
+        except:
+            pass
+        return
+    
+    # Get submitter info
+    submitter_id = post.user_id
+    category = post.category
+    
+    # Start rejection reason flow - ask admin for reason
+    context.user_data['admin_rejecting_post_id'] = post_id
+    context.user_data['admin_rejecting_submitter_id'] = submitter_id
+    context.user_data['admin_rejecting_category'] = category
+    context.user_data['admin_rejecting_post'] = post
+    context.user_data['state'] = 'admin_providing_rejection_reason'
+    
+    # Create keyboard with quick reason options and custom option
+    # Use short callback data to avoid Telegram's 64-byte limit
+    quick_reasons = [
+        [InlineKeyboardButton("❌ Inappropriate Content", callback_data=f"qreject_{post_id}_1")],
+        [InlineKeyboardButton("📝 Incomplete/Unclear", callback_data=f"qreject_{post_id}_2")],
+        [InlineKeyboardButton("🔁 Duplicate Content", callback_data=f"qreject_{post_id}_3")],
+        [InlineKeyboardButton("⚠️ Spam/Low Quality", callback_data=f"qreject_{post_id}_4")],
+        [InlineKeyboardButton("✏️ Write Custom Reason", callback_data=f"custom_reject_{post_id}")],
+        [InlineKeyboardButton("🚫 Cancel Rejection", callback_data=f"cancel_reject_{post_id}")]
+    ]
+    reply_markup = InlineKeyboardMarkup(quick_reasons)
+    
+    try:
+        await query.edit_message_text(
+            "📝 *Please provide a reason for rejection:*\n\n"
+            "Choose a quick reason below or select 'Write Custom Reason' to provide your own specific feedback\\.",
+            reply_markup=reply_markup,
+            parse_mode="MarkdownV2"
+        )
+    except Exception as e:
+        logging.error(f"Error showing rejection reason options: {e}")
+        # Fallback to direct rejection if UI fails
+        await asyncio.to_thread(reject_post, post_id, "Rejected by admin")
         try:
-            await query.edit_message_text("🚩 Submission flagged for review.")
+            await query.edit_message_text("❌ Submission rejected.")
         except:
             pass
 
-    elif data.startswith("block_"):
-        # Handle blocking
-        block_uid = int(data.split("_")[1])
-        block_user(block_uid)
-        
+
+async def _quick_reject_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Reject a submission with one of the predefined reasons"""
+    # Handle quick rejection with predefined reason using short callback data
+    parts = data.split("_")  # qreject_postid_reasoncode
+    if len(parts) < 3:
+        return
+    
+    post_id = int(parts[1])  # Extract post_id
+    reason_code = parts[2]   # Extract reason code
+    
+    # Map reason codes to full rejection messages
+    reason_map = {
+        "1": "Inappropriate content - violates community guidelines",
+        "2": "Incomplete or unclear submission", 
+        "3": "Duplicate or repetitive content",
+        "4": "Spam or low quality content"
+    }
+    
+    rejection_reason = reason_map.get(reason_code, "Rejected by admin")
+    
+    await handle_final_rejection(update, context, post_id, rejection_reason)
+
+
+async def _custom_reject_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Ask the admin to type a custom rejection reason"""
+    # Handle custom rejection reason request
+    post_id = int(data.split("_")[2])
+    context.user_data['admin_rejecting_post_id'] = post_id
+    context.user_data['state'] = 'admin_writing_rejection_reason'
+    
+    # Create cancel button
+    cancel_keyboard = [[InlineKeyboardButton("🚫 Cancel", callback_data=f"cancel_reject_{post_id}")]]
+    cancel_reply_markup = InlineKeyboardMarkup(cancel_keyboard)
+    
+    try:
+        await query.edit_message_text(
+            "✏️ *Please type your custom rejection reason:*\n\n"
+            "Provide specific feedback to help the user understand why their submission was rejected\\. "
+            "Be constructive and helpful in your explanation\\.",
+            reply_markup=cancel_reply_markup,
+            parse_mode="MarkdownV2"
+        )
+    except Exception as e:
+        logging.error(f"Error requesting custom rejection reason: {e}")
+
+
+async def _cancel_reject_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Cancel a rejection and restore the moderation buttons"""
+    # Handle cancellation of rejection
+    post_id = int(data.split("_")[2])
+    
+    # Get post details to access user_id
+    post = _rejecting_post(context, post_id)
+    if post is None:
+        post = await asyncio.to_thread(get_post_by_id, post_id)
+    if not post:
         try:
-            await query.edit_message_text(f"⛔ User {block_uid} blocked.")
+            await query.edit_message_text("❗ Post not found.")
         except:
             pass
+        return
+    
+    # Clear rejection state
+    context.user_data.pop('admin_rejecting_post_id', None)
+    context.user_data.pop('admin_rejecting_submitter_id', None)
+    context.user_data.pop('admin_rejecting_category', None)
+    context.user_data.pop('admin_rejecting_post', None)
+    context.user_data.pop('state', None)
+    
+    # Restore original admin panel for this post
+    keyboard = [
+        [
+            InlineKeyboardButton("✅ Approve", callback_data=f"approve_{post_id}"),
+            InlineKeyboardButton("❌ Reject", callback_data=f"reject_{post_id}")
+        ],
+        [
+            InlineKeyboardButton("🚩 Flag", callback_data=f"flag_{post_id}"),
+            InlineKeyboardButton("⛔ Block User", callback_data=f"block_{post.user_id}")
+        ]
+    ]
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    
+    try:
+        await query.edit_message_text(
+            "🔄 *Rejection cancelled\\.*\n\n"
+            "Please choose an action for this submission\\:",
+            reply_markup=reply_markup,
+            parse_mode="MarkdownV2"
+        )
+    except Exception as e:
+        logging.error(f"Error cancelling rejection: {e}")
 
-    elif data.startswith("unblock_"):
-        # Handle unblocking
-        block_uid = int(data.split("_")[1])
-        unblock_user(block_uid)
-        
+
+async def _flag_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Flag a submission for review"""
+    # Handle flagging
+    post_id = int(data.split("_")[1])
+    await asyncio.to_thread(flag_post, post_id)
+    
+    try:
+        await query.edit_message_text("🚩 Submission flagged for review.")
+    except:
+        pass
+
+
+async def _block_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Block the submitter"""
+    # Handle blocking
+    block_uid = int(data.split("_")[1])
+    await asyncio.to_thread(block_user, block_uid)
+    
+    try:
+        await query.edit_message_text(f"⛔ User {block_uid} blocked.")
+    except:
+        pass
+
+
+async def _unblock_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, query, data: str, admin_id: int):
+    """Unblock a user"""
+    # Handle unblocking
+    block_uid = int(data.split("_")[1])
+    await asyncio.to_thread(unblock_user, block_uid)
+    
+    try:
+        await query.edit_message_text(f"✅ User {block_uid} unblocked.")
+    except:
+        pass
+
+# Callback data is "<action>_<args>"; actions starting with these words
+# are two words long (custom_reject, cancel_reject)
+_TWO_WORD_CALLBACK_PREFIXES = frozenset({"custom", "cancel"})
+
+_ADMIN_CALLBACK_HANDLERS = {
+    "approve": _approve_callback,
+    "reject": _reject_callback,
+    "qreject": _quick_reject_callback,
+    "custom_reject": _custom_reject_callback,
+    "cancel_reject": _cancel_reject_callback,
+    "flag": _flag_callback,
+    "block": _block_callback,
+    "unblock": _unblock_callback,
+}
+
+async def admin_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle admin approval/rejection callbacks"""
+    if not update or not update.callback_query:
+        return
+    
+    query = update.callback_query
+    await query.answer()
+    
+    if not query or not query.data:
+        return
+    
+    data = query.data
+    admin_id = None
+    if update and update.effective_user:
+        admin_id = update.effective_user.id
+    
+    if admin_id not in ADMIN_IDS:
         try:
-            await query.edit_message_text(f"✅ User {block_uid} unblocked.")
+            await query.edit_message_text("❗ You are not authorized to moderate.")
         except:
             pass
+        return
 
-    # Handle other cases
+    # Dispatch on the action prefix with one dict lookup
+    action, sep, rest = data.partition("_")
+    if not sep:
+        return
+    if action in _TWO_WORD_CALLBACK_PREFIXES:
+        action = f"{action}_{rest.partition('_')[0]}"
+    handler = _ADMIN_CALLBACK_HANDLERS.get(action)
+    if handler:
+        await handler(update, context, query, data, admin_id)
@@ -13,6 +13,11 @@ import schedule
 import threading
 import time
 
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 from config import DB_PATH, BACKUPS_DIR, ENABLE_AUTO_BACKUP, BACKUP_INTERVAL_HOURS
 from logger import get_logger
 
@@ -134,7 +139,7 @@ class BackupManager:
             # Get backups from filesystem
             backup_files = []
             for filename in os.listdir(self.backup_dir):
-                if filename.startswith("confession_bot_backup_") and filename.endswith(".gz"):
+                if filename.startswith("confession_bot_backup_") and filename.endswith((".gz", ".zst")):
                     file_path = os.path.join(self.backup_dir, filename)
                     backup_files.append({
                         'filename': filename,
@@ -205,7 +210,16 @@ class BackupManager:
             shutil.copy2(self.db_path, current_backup_path)
             
             # Decompress backup if needed
-            if backup_filename.endswith('.gz'):
+            compressed = backup_filename.endswith(('.gz', '.zst'))
+            if backup_filename.endswith('.zst'):
+                if zstd is None:
+                    return False, "zstandard is required to restore .zst backups"
+                temp_db_path = backup_path[:-4]  # Remove .zst extension
+                with open(backup_path, 'rb') as f_in:
+                    with open(temp_db_path, 'wb') as f_out:
+                        zstd.ZstdDecompressor().copy_stream(f_in, f_out)
+                source_path = temp_db_path
+            elif backup_filename.endswith('.gz'):
                 temp_db_path = backup_path[:-3]  # Remove .gz extension
                 with gzip.open(backup_path, 'rb') as f_in:
                     with open(temp_db_path, 'wb') as f_out:
@@ -219,7 +233,7 @@ class BackupManager:
                 with sqlite3.connect(source_path) as test_conn:
                     test_conn.execute("SELECT COUNT(*) FROM sqlite_master")
             except sqlite3.Error as e:
-                if backup_filename.endswith('.gz') and os.path.exists(temp_db_path):
+                if compressed and os.path.exists(temp_db_path):
                     os.remove(temp_db_path)
                 return False, f"Backup file is corrupted: {e}"
             
@@ -227,7 +241,7 @@ class BackupManager:
             shutil.copy2(source_path, self.db_path)
             
             # Clean up temporary file
-            if backup_filename.endswith('.gz') and os.path.exists(temp_db_path):
+            if compressed and os.path.exists(temp_db_path):
                 os.remove(temp_db_path)
             
             logger.info(f"Database restored from backup: {backup_filename}")
@@ -26,7 +26,7 @@ from admin_report_management import (
 )
 from stats import get_user_stats, get_channel_stats
 from utils import *
-from admin_messaging import send_message_to_admins, get_pending_messages, send_admin_reply_to_user
+from admin_messaging import send_message_to_admins, get_pending_messages, send_admin_reply_to_user, start_admin_broadcast_worker
 from admin_deletion import (
     delete_post_completely, 
     delete_comment_completely, 
@@ -35,7 +35,7 @@ from admin_deletion import (
     clear_reports_for_content,
     delete_channel_message
 )
-from admin_user_activity import admin_user_posts_callback, admin_user_comments_callback
+from admin_user_activity import admin_user_posts_callback, admin_user_comments_callback, invalidate_user_activity_cache
 
 # Import improvement modules
 from rate_limiter import rate_limiter, handle_rate_limit_decorator
@@ -44,6 +44,7 @@ from logger import bot_logger
 from migrations import run_migrations
 from analytics import analytics_manager
 from backup_system import start_backup_system
+from db_connection import start_db_maintenance, stop_db_maintenance
 
 # Import enhanced ranking system modules
 from enhanced_ranking_ui import enhanced_ranking_callback_handler, show_enhanced_ranking_menu
@@ -2820,8 +2821,8 @@ async def handle_admin_contact(update: Update, context: ContextTypes.DEFAULT_TYP
     
     if success:
         await update.message.reply_text(
-            "✅ *Message Sent\\!*\n\n"
-            "Your message has been sent to the administrators\\. "
+            "✅ *Message Received\\!*\n\n"
+            "Your message has been saved and will be forwarded to the administrators\\. "
             "They may reply to you anonymously\\.",
             parse_mode="MarkdownV2"
         )
@@ -3022,6 +3023,8 @@ async def daily_digest(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # Callback Handlers
 async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle all callback queries"""
+    import asyncio
+    
     query = update.callback_query
     await query.answer()
     
@@ -3107,7 +3110,8 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Like comment
     if data.startswith("like_comment_"):
         comment_id = int(data.replace("like_comment_", ""))
-        success, action, likes, dislikes = react_to_comment(user_id, comment_id, "like")
+        # Reactions go through the pool's single writer, off the event loop
+        success, action, likes, dislikes = await asyncio.to_thread(react_to_comment, user_id, comment_id, "like")
         
         if success:
             # Update the current message with new reaction counts
@@ -3172,7 +3176,7 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Dislike comment
     if data.startswith("dislike_comment_"):
         comment_id = int(data.replace("dislike_comment_", ""))
-        success, action, likes, dislikes = react_to_comment(user_id, comment_id, "dislike")
+        success, action, likes, dislikes = await asyncio.to_thread(react_to_comment, user_id, comment_id, "dislike")
         
         if success:
             # Update the current message with new reaction counts
@@ -7434,6 +7438,8 @@ async def handle_confirm_delete_post_callback(update: Update, context: ContextTy
         success, deletion_stats = delete_post_completely(post_id, user_id)
         
         if success:
+            invalidate_user_activity_cache()
+            
             # Create success message with deletion statistics (use HTML to avoid MarkdownV2 escaping issues)
             success_text = (
                 f"<b>✅ Post Deleted Successfully</b>\n\n"
@@ -7691,6 +7697,8 @@ async def handle_confirm_delete_comment_callback(update: Update, context: Contex
         success, deletion_stats = delete_comment_completely(comment_id, user_id)
         
         if success:
+            invalidate_user_activity_cache()
+            
             # Update the channel message comment count if post exists
             if post_id:
                 try:
@@ -7785,6 +7793,21 @@ async def handle_confirm_delete_comment_callback(update: Update, context: Contex
             parse_mode="HTML"
         )
 
+async def post_init(application: Application):
+    """Start background workers once the application's event loop is running"""
+    start_admin_broadcast_worker()
+    
+    # Warm the channel Chat cache so the first approval skips get_chat
+    from approval import get_channel_chat
+    try:
+        await get_channel_chat(application.bot)
+    except Exception as e:
+        logger.warning(f"Channel not accessible at startup: {e}")
+
+async def post_shutdown(application: Application):
+    """Stop background database maintenance and close pooled connections"""
+    stop_db_maintenance()
+
 def main():
     """Main function to run the bot"""
     # Import instance manager
@@ -7810,6 +7833,9 @@ def main():
     logger.info("Starting backup system...")
     start_backup_system()
     
+    # Periodic incremental vacuum + PRAGMA optimize
+    start_db_maintenance()
+    
     # Create application with connection settings
     from telegram.request import HTTPXRequest
     
@@ -7822,7 +7848,7 @@ def main():
         connect_timeout=10.0
     )
     
-    application = Application.builder().token(BOT_TOKEN).request(request).build()
+    application = Application.builder().token(BOT_TOKEN).request(request).post_init(post_init).post_shutdown(post_shutdown).build()
     
     # Add error handler
     application.add_error_handler(global_error_handler)
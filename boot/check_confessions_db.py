@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import sqlite3
+from check_db import count_rows
 
 def check_confessions_db():
     conn = sqlite3.connect('confessions.db')
@@ -14,12 +15,15 @@ def check_confessions_db():
     
     print("\n" + "="*50 + "\n")
     
+    # Count every table we report on in one query
+    table_names = {table[0] for table in tables}
+    counts = count_rows(cursor, [name for name in ('reports', 'reactions', 'comments') if name in table_names])
+    
     # Check if reports and reactions tables exist now
     if ('reports',) in tables:
         print("Reports table exists!")
         # Check if there are any reports
-        cursor.execute("SELECT COUNT(*) FROM reports")
-        count = cursor.fetchone()[0]
+        count = counts['reports']
         print(f"Number of reports: {count}")
         
         if count > 0:
@@ -34,8 +38,7 @@ def check_confessions_db():
     if ('reactions',) in tables:
         print("Reactions table exists!")
         # Check if there are any reactions
-        cursor.execute("SELECT COUNT(*) FROM reactions")
-        count = cursor.fetchone()[0]
+        count = counts['reactions']
         print(f"Number of reactions: {count}")
     
     print("\n" + "="*50 + "\n")
@@ -43,8 +46,7 @@ def check_confessions_db():
     # Check comments table
     if ('comments',) in tables:
         print("Comments table exists!")
-        cursor.execute("SELECT COUNT(*) FROM comments")
-        count = cursor.fetchone()[0]
+        count = counts['comments']
         print(f"Number of comments: {count}")
         
         if count > 0:
@@ -4,6 +4,51 @@ Debug script to check database structure
 """
 import sqlite3
 
+def count_rows(cursor, table_names):
+    """
+    Count rows for every table in one UNION ALL query.
+    Returns {table_name: count or error message}.
+    """
+    if not table_names:
+        return {}
+    query = " UNION ALL ".join(
+        "SELECT ?, COUNT(*) FROM \"{}\"".format(name.replace('"', '""')) for name in table_names
+    )
+    try:
+        return dict(cursor.execute(query, list(table_names)).fetchall())
+    except sqlite3.Error:
+        # One unreadable table (e.g. a virtual table without its module)
+        # fails the whole UNION; fall back to counting one at a time
+        counts = {}
+        for name in table_names:
+            try:
+                cursor.execute("SELECT COUNT(*) FROM \"{}\"".format(name.replace('"', '""')))
+                counts[name] = cursor.fetchone()[0]
+            except sqlite3.Error as e:
+                counts[name] = e
+        return counts
+
+def estimate_rows(cursor, table_names):
+    """
+    Approximate row counts from the planner statistics in sqlite_stat1,
+    which PRAGMA optimize keeps fresh, instead of scanning every table.
+    Tables without statistics are counted exactly.
+    """
+    wanted = set(table_names)
+    estimates = {}
+    try:
+        cursor.execute("""
+            SELECT tbl, MAX(CAST(substr(stat, 1, instr(stat || ' ', ' ') - 1) AS INTEGER))
+            FROM sqlite_stat1
+            GROUP BY tbl
+        """)
+        estimates = {tbl: rows for tbl, rows in cursor.fetchall() if tbl in wanted}
+    except sqlite3.OperationalError:
+        # Database has never been analyzed
+        pass
+    estimates.update(count_rows(cursor, [name for name in table_names if name not in estimates]))
+    return estimates
+
 def check_database():
     try:
         conn = sqlite3.connect('bot.db')
@@ -11,57 +56,50 @@ def check_database():
         
         print("🔍 Checking database structure...")
         
-        # Get all tables
+        # Get all tables and their (estimated) row counts
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
+        table_names = [row[0] for row in cursor.fetchall()]
+        estimates = estimate_rows(cursor, table_names)
         
-        print(f"\n📋 Found {len(tables)} tables:")
-        for table in tables:
-            table_name = table[0]
+        print(f"\n📋 Found {len(table_names)} tables:")
+        for table_name in table_names:
             print(f"  - {table_name}")
             
-            # Get count for each table
-            try:
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                print(f"    Records: {count}")
-            except Exception as e:
-                print(f"    Error counting records: {e}")
+            count = estimates.get(table_name)
+            if isinstance(count, Exception):
+                print(f"    Error counting records: {count}")
+            else:
+                print(f"    Records: ~{count}")
         
         # Check specific tables we need
         required_tables = ['reports', 'comments', 'posts', 'users']
         
         print(f"\n🔍 Checking required tables...")
+        existing_tables = set(table_names)
+        # Exact counts here, since an empty reports table triggers seeding
+        counts = count_rows(cursor, [name for name in required_tables if name in existing_tables])
         for table_name in required_tables:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-            exists = cursor.fetchone()
-            
-            if exists:
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
+            if table_name in existing_tables:
+                count = counts[table_name]
                 print(f"  ✅ {table_name}: {count} records")
                 
                 # Show schema for reports table
                 if table_name == 'reports' and count == 0:
                     print("    🔧 Creating test report...")
                     # First check if we have comments
-                    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='comments'")
-                    comments_exist = cursor.fetchone()
-                    
-                    if comments_exist:
-                        cursor.execute("SELECT COUNT(*) FROM comments")
-                        comment_count = cursor.fetchone()[0]
+                    if 'comments' in existing_tables:
+                        comment_count = counts['comments']
                         print(f"    📝 Comments available: {comment_count}")
                         
                         if comment_count > 0:
-                            cursor.execute("SELECT comment_id FROM comments LIMIT 1")
+                            cursor.execute("""
+                                INSERT INTO reports (user_id, target_type, target_id, reason)
+                                SELECT ?, 'comment', comment_id, ? FROM comments LIMIT 1
+                                RETURNING target_id
+                            """, (999999999, 'Test report for admin testing'))
                             first_comment = cursor.fetchone()
+                            conn.commit()
                             if first_comment:
-                                cursor.execute("""
-                                    INSERT INTO reports (user_id, target_type, target_id, reason)
-                                    VALUES (?, ?, ?, ?)
-                                """, (999999999, 'comment', first_comment[0], 'Test report for admin testing'))
-                                conn.commit()
                                 print(f"    ✅ Created test report for comment #{first_comment[0]}")
                     else:
                         print("    ❌ No comments table found")
@@ -20,11 +20,19 @@ def check_table_exists(cursor, table_name):
     """, (table_name,))
     return cursor.fetchone() is not None
 
-def get_table_schema(cursor, table_name):
-    """Get the schema of a table"""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
-    return columns
+def get_table_schemas(cursor, table_names):
+    """Get the schemas of several tables in one query, as PRAGMA table_info rows"""
+    placeholders = ",".join("?" * len(table_names))
+    cursor.execute(f"""
+        SELECT m.name, p.cid, p.name, p.type, p."notnull", p.dflt_value, p.pk
+        FROM sqlite_master m JOIN pragma_table_info(m.name) p
+        WHERE m.type='table' AND m.name IN ({placeholders})
+        ORDER BY m.name, p.cid
+    """, list(table_names))
+    schemas = {}
+    for table_name, *column in cursor.fetchall():
+        schemas.setdefault(table_name, []).append(tuple(column))
+    return schemas
 
 def check_migrations_status(cursor):
     """Check which migrations have been applied"""
@@ -59,14 +67,14 @@ def main():
             
             # Check ranking system tables specifically
             ranking_tables = ['user_rankings', 'point_transactions', 'rank_definitions', 'user_achievements']
+            schemas = get_table_schemas(cursor, ranking_tables + ['posts'])
             print("RANKING SYSTEM TABLES:")
             print("-" * 25)
             for table in ranking_tables:
-                if check_table_exists(cursor, table):
+                if table in schemas:
                     print(f"  ✓ {table} - EXISTS")
                     # Show schema
-                    schema = get_table_schema(cursor, table)
-                    for col in schema:
+                    for col in schemas[table]:
                         print(f"    - {col[1]} ({col[2]})")
                 else:
                     print(f"  ✗ {table} - MISSING")
@@ -84,11 +92,10 @@ def main():
             print()
             
             # Check posts table schema specifically
-            if check_table_exists(cursor, 'posts'):
+            if 'posts' in schemas:
                 print("POSTS TABLE SCHEMA:")
                 print("-" * 20)
-                schema = get_table_schema(cursor, 'posts')
-                for col in schema:
+                for col in schemas['posts']:
                     print(f"  {col[1]} ({col[2]}) - {col[5] if col[5] else 'no default'}")
                 print()
 
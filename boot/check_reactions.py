@@ -5,45 +5,26 @@ def check_tables():
     conn = sqlite3.connect('bot.db')
     cursor = conn.cursor()
     
-    # List all tables
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    # List all tables along with their schemas in one query
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table'")
     tables = cursor.fetchall()
     print("All tables in database:")
     for table in tables:
         print(f"- {table[0]}")
-    
-    print("\n" + "="*50 + "\n")
-    
-    # Check reactions table
-    cursor.execute('SELECT sql FROM sqlite_master WHERE name="reactions"')
-    result = cursor.fetchone()
-    if result:
-        print("Reactions table schema:")
-        print(result[0])
-    else:
-        print("Reactions table not found")
-    
-    print("\n" + "="*50 + "\n")
-    
-    # Check if there's a comment_reactions table instead
-    cursor.execute('SELECT sql FROM sqlite_master WHERE name="comment_reactions"')
-    result = cursor.fetchone()
-    if result:
-        print("Comment_reactions table schema:")
-        print(result[0])
-    else:
-        print("Comment_reactions table not found")
-    
-    print("\n" + "="*50 + "\n")
-    
-    # Check reports table
-    cursor.execute('SELECT sql FROM sqlite_master WHERE name="reports"')
-    result = cursor.fetchone()
-    if result:
-        print("Reports table schema:")
-        print(result[0])
-    else:
-        print("Reports table not found")
+    schemas = dict(tables)
+    
+    for table_name, label in (
+        ("reactions", "Reactions"),
+        # Check if there's a comment_reactions table instead
+        ("comment_reactions", "Comment_reactions"),
+        ("reports", "Reports"),
+    ):
+        print("\n" + "="*50 + "\n")
+        if table_name in schemas:
+            print(f"{label} table schema:")
+            print(schemas[table_name])
+        else:
+            print(f"{label} table not found")
     
     conn.close()
 
@@ -12,11 +12,12 @@ def check_reports():
         
         print("🔍 Checking reports table...")
         
-        # Check if reports table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reports'")
-        table_exists = cursor.fetchone()
+        # Table schema doubles as the existence check: no columns, no table
+        schema_query = "SELECT name, type FROM pragma_table_info('reports')"
+        cursor.execute(schema_query)
+        schema = cursor.fetchall()
         
-        if not table_exists:
+        if not schema:
             print("❌ Reports table doesn't exist!")
             # Create reports table
             cursor.execute("""
@@ -31,15 +32,14 @@ def check_reports():
             """)
             conn.commit()
             print("✅ Created reports table")
+            cursor.execute(schema_query)
+            schema = cursor.fetchall()
         else:
             print("✅ Reports table exists")
         
-        # Get table schema
-        cursor.execute("PRAGMA table_info(reports)")
-        schema = cursor.fetchall()
         print("\n📋 Reports table schema:")
-        for col in schema:
-            print(f"  - {col[1]} ({col[2]})")
+        for name, col_type in schema:
+            print(f"  - {name} ({col_type})")
         
         # Count total reports
         cursor.execute("SELECT COUNT(*) FROM reports")
@@ -84,14 +84,14 @@ def check_reports():
             if comment_count > 0:
                 print("\n💡 Creating a test report...")
                 # Create a test report for the first comment
-                cursor.execute("SELECT comment_id FROM comments LIMIT 1")
+                cursor.execute("""
+                    INSERT INTO reports (user_id, target_type, target_id, reason)
+                    SELECT ?, 'comment', comment_id, ? FROM comments LIMIT 1
+                    RETURNING target_id
+                """, (999999999, 'Test report for debugging'))
                 first_comment = cursor.fetchone()
+                conn.commit()
                 if first_comment:
-                    cursor.execute("""
-                        INSERT INTO reports (user_id, target_type, target_id, reason)
-                        VALUES (?, ?, ?, ?)
-                    """, (999999999, 'comment', first_comment[0], 'Test report for debugging'))
-                    conn.commit()
                     print(f"✅ Created test report for comment #{first_comment[0]}")
         
         conn.close()
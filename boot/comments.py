@@ -1,28 +1,104 @@
-import sqlite3
+import asyncio
+from functools import lru_cache
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from config import DB_PATH, COMMENTS_PER_PAGE, CHANNEL_ID, BOT_USERNAME
-from utils import escape_markdown_text
-from db import get_comment_count
-from submission import is_media_post, get_media_info
+from config import COMMENTS_PER_PAGE, CHANNEL_ID, BOT_USERNAME
+from db_connection import get_sqlite_pool
+from utils import escape_markdown_text, categories_to_hashtags
+
+_INSERT_COMMENT_SQL = """
+    INSERT INTO comments (post_id, content, user_id, parent_comment_id)
+    VALUES (?, ?, ?, ?)
+    RETURNING comment_id
+"""
+_INC_USER_COMMENTS_SQL = "UPDATE users SET comments_posted = comments_posted + 1 WHERE user_id = ?"
+
+_GET_POST_CHANNEL_INFO_SQL = (
+    "SELECT post_id, content, category, channel_message_id, approved FROM posts WHERE post_id = ?"
+)
+_CHANNEL_UPDATE_POST_SQL = """
+    SELECT post_id, content, category, channel_message_id, approved, post_number, comment_count,
+           media_type, media_caption
+    FROM posts WHERE post_id = ?
+"""
+
+# Paginated comments in chronological order (flat structure), with each
+# reply's quoted parent joined in and the post's total comment count on
+# every row
+_COMMENTS_PAGE_SQL = """
+    SELECT c.comment_id, c.content, c.timestamp, c.likes, c.dislikes, c.flagged, c.parent_comment_id,
+           ROW_NUMBER() OVER (ORDER BY c.timestamp ASC, c.comment_id ASC) as comment_number,
+           p.comment_id, p.content, p.timestamp,
+           COUNT(*) OVER () as total_comments
+    FROM comments c
+    LEFT JOIN comments p ON p.comment_id = c.parent_comment_id
+    WHERE c.post_id = ?
+    ORDER BY c.timestamp ASC, c.comment_id ASC
+    LIMIT ? OFFSET ?
+"""
+_COUNT_POST_COMMENTS_SQL = "SELECT COUNT(*) FROM comments WHERE post_id = ?"
+
+# Explicit columns keep the tuple layout callers index into stable as
+# columns are added to the table
+_GET_COMMENT_SQL = """
+    SELECT comment_id, post_id, user_id, content, parent_comment_id, timestamp, likes, dislikes, flagged
+    FROM comments WHERE comment_id = ?
+"""
+_GET_COMMENT_COUNTS_SQL = "SELECT likes, dislikes FROM comments WHERE comment_id = ?"
+_FLAG_COMMENT_SQL = "UPDATE comments SET flagged = 1 WHERE comment_id = ?"
+
+_GET_USER_REACTION_SQL = (
+    "SELECT reaction_type FROM reactions WHERE user_id = ? AND target_type = 'comment' AND target_id = ?"
+)
+_DELETE_REACTION_SQL = (
+    "DELETE FROM reactions WHERE user_id = ? AND target_type = 'comment' AND target_id = ?"
+)
+_UPSERT_REACTION_SQL = """
+    INSERT INTO reactions (user_id, target_type, target_id, reaction_type)
+    VALUES (?, 'comment', ?, ?)
+    ON CONFLICT(user_id, target_type, target_id)
+    DO UPDATE SET reaction_type = excluded.reaction_type
+"""
+
+# A comment's number is its position in the page ordering above, counted
+# on the (post_id, timestamp, ...) covering index
+_COMMENT_POSITION_SQL = """
+    SELECT (SELECT COUNT(*) FROM comments c
+            WHERE c.post_id = t.post_id
+              AND (c.timestamp < t.timestamp
+                   OR (c.timestamp = t.timestamp AND c.comment_id <= t.comment_id)))
+    FROM comments t WHERE t.comment_id = ?
+"""
+_GET_PARENT_ID_SQL = "SELECT parent_comment_id FROM comments WHERE comment_id = ?"
+_GET_PARENT_COMMENT_SQL = "SELECT comment_id, post_id, content, timestamp FROM comments WHERE comment_id = ?"
+
+# Resolve the comment (or, for a reply, its parent) and count the parent
+# comments before it in one statement
+_FIND_COMMENT_PAGE_SQL = """
+    WITH target AS (
+        SELECT post_id, COALESCE(NULLIF(parent_comment_id, 0), comment_id) AS target_comment_id
+        FROM comments WHERE comment_id = ?
+    )
+    SELECT target.post_id, target.target_comment_id,
+           (SELECT COUNT(*) FROM comments
+            WHERE post_id = target.post_id AND parent_comment_id IS NULL
+              AND comment_id < target.target_comment_id)
+    FROM target
+"""
 
 
 def save_comment(post_id, content, user_id, parent_comment_id=None):
     """Save a comment to the database"""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
+            # Comment and user stats are written in the same transaction
             cursor.execute(
-                "INSERT INTO comments (post_id, content, user_id, parent_comment_id) VALUES (?, ?, ?, ?)",
+                _INSERT_COMMENT_SQL,
                 (post_id, content, user_id, parent_comment_id)
             )
-            comment_id = cursor.lastrowid
-
-            # Update user stats
-            cursor.execute(
-                "UPDATE users SET comments_posted = comments_posted + 1 WHERE user_id = ?",
-                (user_id,)
-            )
-            conn.commit()
+            comment_id = cursor.fetchone()[0]
+            cursor.execute(_INC_USER_COMMENTS_SQL, (user_id,))
             return comment_id, None
     except Exception as e:
         return None, f"Database error: {str(e)}"
@@ -30,12 +106,9 @@ def save_comment(post_id, content, user_id, parent_comment_id=None):
 
 def get_post_with_channel_info(post_id):
     """Get post information including channel message ID"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT post_id, content, category, channel_message_id, approved FROM posts WHERE post_id = ?",
-            (post_id,)
-        )
+        cursor.execute(_GET_POST_CHANNEL_INFO_SQL, (post_id,))
         return cursor.fetchone()
 
 
@@ -43,27 +116,19 @@ def get_comments_paginated(post_id, page=1):
     """Get comments for a post in flat structure like Telegram native replies"""
     offset = (page - 1) * COMMENTS_PER_PAGE
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
 
-        # Get total count of ALL comments for this post (flat structure)
-        cursor.execute(
-            "SELECT COUNT(*) FROM comments WHERE post_id = ?",
-            (post_id,)
-        )
-        total_comments = cursor.fetchone()[0]
-
-        # Get paginated comments in chronological order (flat structure)
-        cursor.execute('''
-            SELECT comment_id, content, timestamp, likes, dislikes, flagged, parent_comment_id,
-                   ROW_NUMBER() OVER (ORDER BY timestamp ASC) as comment_number
-            FROM comments 
-            WHERE post_id = ?
-            ORDER BY timestamp ASC
-            LIMIT ? OFFSET ?
-        ''', (post_id, COMMENTS_PER_PAGE, offset))
+        cursor.execute(_COMMENTS_PAGE_SQL, (post_id, COMMENTS_PER_PAGE, offset))
         comments = cursor.fetchall()
 
+        if comments:
+            total_comments = comments[0][11]
+        else:
+            # Past the last page (or no comments): count separately
+            cursor.execute(_COUNT_POST_COMMENTS_SQL, (post_id,))
+            total_comments = cursor.fetchone()[0]
+
         # Transform into simplified flat structure
         comments_flat = []
         for comment in comments:
@@ -88,20 +153,13 @@ def get_comments_paginated(post_id, page=1):
                 'is_reply': parent_comment_id is not None
             }
             
-            # If this is a reply, get the original comment info for quoting
-            if parent_comment_id:
-                cursor.execute('''
-                    SELECT comment_id, content, timestamp 
-                    FROM comments 
-                    WHERE comment_id = ?
-                ''', (parent_comment_id,))
-                original = cursor.fetchone()
-                if original:
-                    comment_data['original_comment'] = {
-                        'comment_id': original[0],
-                        'content': original[1],
-                        'timestamp': original[2]
-                    }
+            # If this is a reply, attach the original comment info for quoting
+            if parent_comment_id and comment[8] is not None:
+                comment_data['original_comment'] = {
+                    'comment_id': comment[8],
+                    'content': comment[9],
+                    'timestamp': comment[10]
+                }
             
             comments_flat.append(comment_data)
 
@@ -112,91 +170,34 @@ def get_comments_paginated(post_id, page=1):
 
 def get_comment_by_id(comment_id):
     """Get a specific comment by ID"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM comments WHERE comment_id = ?",
-            (comment_id,)
-        )
+        cursor.execute(_GET_COMMENT_SQL, (comment_id,))
         return cursor.fetchone()
 
 
 def react_to_comment(user_id, comment_id, reaction_type):
     """Add or update reaction to a comment"""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_sqlite_pool().writer() as conn:
             cursor = conn.cursor()
 
             # Check existing reaction
-            cursor.execute(
-                "SELECT reaction_type FROM reactions WHERE user_id = ? AND target_type = 'comment' AND target_id = ?",
-                (user_id, comment_id)
-            )
+            cursor.execute(_GET_USER_REACTION_SQL, (user_id, comment_id))
             existing = cursor.fetchone()
 
-            if existing:
-                if existing[0] == reaction_type:
-                    # Remove reaction if same type
-                    cursor.execute(
-                        "DELETE FROM reactions WHERE user_id = ? AND target_type = 'comment' AND target_id = ?",
-                        (user_id, comment_id)
-                    )
-                    # Update comment counts
-                    if reaction_type == 'like':
-                        cursor.execute(
-                            "UPDATE comments SET likes = likes - 1 WHERE comment_id = ?",
-                            (comment_id,)
-                        )
-                    else:
-                        cursor.execute(
-                            "UPDATE comments SET dislikes = dislikes - 1 WHERE comment_id = ?",
-                            (comment_id,)
-                        )
-                    action = "removed"
-                else:
-                    # Update reaction type
-                    cursor.execute(
-                        "UPDATE reactions SET reaction_type = ? WHERE user_id = ? AND target_type = 'comment' AND target_id = ?",
-                        (reaction_type, user_id, comment_id)
-                    )
-                    # Update comment counts
-                    if existing[0] == 'like':
-                        cursor.execute(
-                            "UPDATE comments SET likes = likes - 1, dislikes = dislikes + 1 WHERE comment_id = ?",
-                            (comment_id,)
-                        )
-                    else:
-                        cursor.execute(
-                            "UPDATE comments SET likes = likes + 1, dislikes = dislikes - 1 WHERE comment_id = ?",
-                            (comment_id,)
-                        )
-                    action = "changed"
+            # Likes/dislikes on comments are kept in step by the reactions triggers
+            if existing and existing[0] == reaction_type:
+                # Remove reaction if same type
+                cursor.execute(_DELETE_REACTION_SQL, (user_id, comment_id))
+                action = "removed"
             else:
-                # Add new reaction
-                cursor.execute(
-                    "INSERT INTO reactions (user_id, target_type, target_id, reaction_type) VALUES (?, 'comment', ?, ?)",
-                    (user_id, comment_id, reaction_type)
-                )
-                # Update comment counts
-                if reaction_type == 'like':
-                    cursor.execute(
-                        "UPDATE comments SET likes = likes + 1 WHERE comment_id = ?",
-                        (comment_id,)
-                    )
-                else:
-                    cursor.execute(
-                        "UPDATE comments SET dislikes = dislikes + 1 WHERE comment_id = ?",
-                        (comment_id,)
-                    )
-                action = "added"
-
-            conn.commit()
+                # Add the reaction, or switch an existing one to the new type
+                cursor.execute(_UPSERT_REACTION_SQL, (user_id, comment_id, reaction_type))
+                action = "changed" if existing else "added"
 
             # Return current counts along with action
-            cursor.execute(
-                "SELECT likes, dislikes FROM comments WHERE comment_id = ?",
-                (comment_id,)
-            )
+            cursor.execute(_GET_COMMENT_COUNTS_SQL, (comment_id,))
             counts = cursor.fetchone()
             current_likes = counts[0] if counts else 0
             current_dislikes = counts[1] if counts else 0
@@ -208,60 +209,37 @@ def react_to_comment(user_id, comment_id, reaction_type):
 
 def flag_comment(comment_id):
     """Flag a comment for review"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().writer() as conn:
         cursor = conn.cursor()
-        cursor.execute("UPDATE comments SET flagged = 1 WHERE comment_id = ?", (comment_id,))
-        conn.commit()
+        cursor.execute(_FLAG_COMMENT_SQL, (comment_id,))
 
 
 def get_user_reaction(user_id, comment_id):
     """Get user's reaction to a specific comment"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT reaction_type FROM reactions WHERE user_id = ? AND target_type = 'comment' AND target_id = ?",
-            (user_id, comment_id)
-        )
+        cursor.execute(_GET_USER_REACTION_SQL, (user_id, comment_id))
         result = cursor.fetchone()
         return result[0] if result else None
 
 
 def get_comment_sequential_number(comment_id):
     """Get the sequential number of a comment within its post (flat structure)"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
 
-        # Get the comment's post_id and timestamp
-        cursor.execute(
-            "SELECT post_id, timestamp FROM comments WHERE comment_id = ?",
-            (comment_id,)
-        )
-        comment_info = cursor.fetchone()
-
-        if not comment_info:
-            return None
-
-        post_id, timestamp = comment_info
-
-        # Count all comments in this post that were posted before or at the same time
-        cursor.execute("""
-            SELECT COUNT(*) FROM comments 
-            WHERE post_id = ? AND timestamp <= ?
-            ORDER BY timestamp ASC
-        """, (post_id, timestamp))
+        # Count the comments in this post up to and including this one
+        cursor.execute(_COMMENT_POSITION_SQL, (comment_id,))
         result = cursor.fetchone()
-        return result[0] if result else 1
+        return result[0] if result else None
 
 
 def get_parent_comment_for_reply(comment_id):
     """Get the original comment details for a reply (flat structure)"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT parent_comment_id FROM comments WHERE comment_id = ?",
-            (comment_id,)
-        )
+        cursor.execute(_GET_PARENT_ID_SQL, (comment_id,))
         result = cursor.fetchone()
 
         if not result or not result[0]:
@@ -269,53 +247,35 @@ def get_parent_comment_for_reply(comment_id):
 
         parent_comment_id = result[0]
 
-        cursor.execute(
-            "SELECT comment_id, post_id, content, timestamp FROM comments WHERE comment_id = ?",
-            (parent_comment_id,)
-        )
+        cursor.execute(_GET_PARENT_COMMENT_SQL, (parent_comment_id,))
         parent_comment = cursor.fetchone()
 
-        if parent_comment:
-            parent_sequential_number = get_comment_sequential_number(parent_comment_id)
-            return {
-                'comment_id': parent_comment[0],
-                'post_id': parent_comment[1],
-                'content': parent_comment[2],
-                'timestamp': parent_comment[3],
-                'sequential_number': parent_sequential_number
-            }
+    # Numbered after returning the reader, so it doesn't hold two at once
+    if parent_comment:
+        parent_sequential_number = get_comment_sequential_number(parent_comment_id)
+        return {
+            'comment_id': parent_comment[0],
+            'post_id': parent_comment[1],
+            'content': parent_comment[2],
+            'timestamp': parent_comment[3],
+            'sequential_number': parent_sequential_number
+        }
 
-        return None
+    return None
 
 
 def find_comment_page(comment_id):
     """Find which page a comment is on for navigation"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_sqlite_pool().connection() as conn:
         cursor = conn.cursor()
         
-        # First get the comment's post_id and check if it's a parent comment
-        cursor.execute(
-            "SELECT post_id, parent_comment_id FROM comments WHERE comment_id = ?",
-            (comment_id,)
-        )
+        cursor.execute(_FIND_COMMENT_PAGE_SQL, (comment_id,))
         comment_info = cursor.fetchone()
         
         if not comment_info:
             return None
             
-        post_id, parent_comment_id = comment_info
-        
-        # If it's a reply, we need to find the parent comment's page
-        target_comment_id = parent_comment_id if parent_comment_id else comment_id
-        
-        # Count parent comments before this one
-        cursor.execute("""
-            SELECT COUNT(*) FROM comments 
-            WHERE post_id = ? AND parent_comment_id IS NULL AND comment_id < ?
-            ORDER BY timestamp ASC
-        """, (post_id, target_comment_id))
-        
-        comments_before = cursor.fetchone()[0]
+        post_id, target_comment_id, comments_before = comment_info
         page = (comments_before // COMMENTS_PER_PAGE) + 1
         
         return {
@@ -325,41 +285,48 @@ def find_comment_page(comment_id):
         }
 
 
+REPLY_QUOTE_MAX_LENGTH = 150
+
+
+@lru_cache(maxsize=4096)
+def _quote_parent(parent_text):
+    """Blockquote for a parent comment; the same parent is quoted by many replies"""
+    # Truncate parent text if too long for better display
+    if len(parent_text) > REPLY_QUOTE_MAX_LENGTH:
+        parent_text = parent_text[:REPLY_QUOTE_MAX_LENGTH] + "..."
+
+    # Use Telegram's native blockquote styling
+    return f"<blockquote expandable>{parent_text}</blockquote>"
+
+
 # Format replies to look like Telegram's native reply feature
 def format_reply(parent_text, child_text, parent_author="Anonymous"):
     """Format reply messages to look like Telegram's native reply feature with blockquote"""
-    # Truncate parent text if too long for better display
-    if len(parent_text) > 150:
-        parent_text = parent_text[:150] + "..."
-    
-    # Use Telegram's native blockquote styling
-    return f"<blockquote expandable>{parent_text}</blockquote>\n\n{child_text}"
+    return f"{_quote_parent(parent_text)}\n\n{child_text}"
+
+
+def _fetch_post_for_channel_update(post_id):
+    """Fetch everything needed to re-render a post's channel message in one query"""
+    with get_sqlite_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_CHANNEL_UPDATE_POST_SQL, (post_id,))
+        return cursor.fetchone()
 
 
 async def update_channel_message_comment_count(context, post_id):
     """Update the comment count on the channel message"""
-    import logging
-    logger = logging.getLogger(__name__)
-
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT post_id, content, category, channel_message_id, approved, post_number FROM posts WHERE post_id = ?",
-                (post_id,)
-            )
-            post_info = cursor.fetchone()
+        post_info = await asyncio.to_thread(_fetch_post_for_channel_update, post_id)
 
         if not post_info or not post_info[3]:
             return False, "No channel message found"
 
-        post_id, content, category, channel_message_id, approved, post_number = post_info
+        (post_id, content, category, channel_message_id, approved, post_number, comment_count,
+         media_type, media_caption) = post_info
 
         if approved != 1:
             return False, "Post not approved"
 
-        comment_count = get_comment_count(post_id)
-
         bot_username_clean = BOT_USERNAME.lstrip('@')
         keyboard = [
             [
@@ -377,38 +344,26 @@ async def update_channel_message_comment_count(context, post_id):
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        categories_text = " ".join(
-            [f"#{cat.strip().replace(' ', '')}" for cat in category.split(",")]
-        )
+        categories_text = categories_to_hashtags(category)
 
-        if is_media_post(post_id):
-            media_info = get_media_info(post_id)
-            if media_info:
-                caption_text = f"<b>Confess # {post_number}</b>"
+        if media_type:
+            caption_text = f"<b>Confess # {post_number}</b>"
 
-                if content and content.strip():
-                    caption_text += f"\n\n{content}"
+            if content and content.strip():
+                caption_text += f"\n\n{content}"
 
-                if media_info.get('caption') and media_info['caption'] != content:
-                    caption_text += f"\n\n{media_info['caption']}"
+            if media_caption and media_caption != content:
+                caption_text += f"\n\n{media_caption}"
 
-                caption_text += f"\n\n{categories_text}"
+            caption_text += f"\n\n{categories_text}"
 
-                await context.bot.edit_message_caption(
-                    chat_id=CHANNEL_ID,
-                    message_id=channel_message_id,
-                    caption=caption_text,
-                    parse_mode="HTML",
-                    reply_markup=reply_markup
-                )
-            else:
-                await context.bot.edit_message_text(
-                    chat_id=CHANNEL_ID,
-                    message_id=channel_message_id,
-                    text=f"<b>Confess # {post_number}</b>\n\n{content}\n\n{categories_text}",
-                    parse_mode="HTML",
-                    reply_markup=reply_markup
-                )
+            await context.bot.edit_message_caption(
+                chat_id=CHANNEL_ID,
+                message_id=channel_message_id,
+                caption=caption_text,
+                parse_mode="HTML",
+                reply_markup=reply_markup
+            )
         else:
             await context.bot.edit_message_text(
                 chat_id=CHANNEL_ID,
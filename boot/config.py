@@ -57,6 +57,9 @@ try:
         admin_id = get_env_int(f"ADMIN_ID_{i}", required=False)
         if admin_id:
             ADMIN_IDS.append(admin_id)
+    
+    # Admin checks run on every callback, so make membership O(1)
+    ADMIN_IDS = frozenset(ADMIN_IDS)
             
 except ConfigError as e:
     logging.error(f"Configuration error: {e}")
@@ -94,6 +97,7 @@ ENABLE_SENTIMENT_ANALYSIS = get_env_bool("ENABLE_SENTIMENT_ANALYSIS", True)
 ENABLE_PROFANITY_FILTER = get_env_bool("ENABLE_PROFANITY_FILTER", True)
 ENABLE_AUTO_BACKUP = get_env_bool("ENABLE_AUTO_BACKUP", True)
 BACKUP_INTERVAL_HOURS = get_env_int("BACKUP_INTERVAL_HOURS", 24, required=False)
+DB_MAINTENANCE_INTERVAL_HOURS = get_env_int("DB_MAINTENANCE_INTERVAL_HOURS", 24, required=False)
 
 # Content Limits
 MAX_CONFESSION_LENGTH = get_env_int("MAX_CONFESSION_LENGTH", 4000, required=False)
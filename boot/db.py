@@ -17,6 +17,18 @@ def init_db():
     with db_conn.get_connection() as conn:
         cursor = conn.cursor()
         
+        if not db_conn.use_postgresql:
+            # Incremental auto-vacuum lets the maintenance job reclaim free pages
+            # without a full VACUUM. It only takes effect before the first table
+            # is created, so existing databases are converted once with VACUUM.
+            cursor.execute('PRAGMA auto_vacuum')
+            if cursor.fetchone()[0] != 2:
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'")
+                if cursor.fetchone()[0]:
+                    logger.info("Converting database to incremental auto-vacuum...")
+                    cursor.execute('VACUUM')
+        
         # Users table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
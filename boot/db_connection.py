@@ -1,6 +1,9 @@
+import atexit
 import os
 import logging
+import queue
 import sqlite3
+import threading
 from typing import Any, Dict, List, Optional, Tuple, Union
 from contextlib import contextmanager
 
@@ -14,12 +17,190 @@ except ImportError:
     psycopg2 = None
 
 from config import (
-    DATABASE_URL, USE_POSTGRESQL, DB_PATH,
+    DATABASE_URL, USE_POSTGRESQL, DB_PATH, DB_MAINTENANCE_INTERVAL_HOURS,
     PG_HOST, PG_PORT, PG_DATABASE, PG_USER, PG_PASSWORD
 )
 
 logger = logging.getLogger(__name__)
 
+class SQLiteConnectionPool:
+    """
+    Bounded pool of pre-configured SQLite connections.
+
+    One dedicated writer connection is shared behind a lock so writes never
+    race each other into SQLITE_BUSY, while up to `max_readers` reader
+    connections are recycled through a queue. Reader connections are opened
+    with query_only so a stray write on them fails instead of competing with
+    the writer. PRAGMAs are applied once per connection when it is opened
+    instead of on every call.
+
+    WAL with synchronous=NORMAL only fsyncs the WAL at checkpoints rather than
+    on every commit. The trade-off: an OS crash or power loss can drop the
+    last few committed transactions, but it never corrupts the database.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -64000",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA foreign_keys = ON",
+    )
+
+    # Pooled connections live for the whole process, so give each one room
+    # to keep every hot statement prepared instead of re-parsing it
+    CACHED_STATEMENTS = 256
+
+    # DDL that only needs to run once per process, not on every request
+    SCHEMA_STATEMENTS = (
+        """
+        CREATE TABLE IF NOT EXISTS admin_actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            admin_user_id INTEGER NOT NULL,
+            action_type TEXT NOT NULL,
+            target_type TEXT NOT NULL,
+            target_id INTEGER NOT NULL,
+            details TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    )
+
+    def __init__(self, db_path: str, max_readers: int = 5, timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.timeout = timeout
+        self._readers = queue.Queue(maxsize=max_readers)
+        self._reader_count = 0
+        self._reader_count_lock = threading.Lock()
+        # Re-entrant so a helper can take the writer while its caller holds it
+        self._writer_lock = threading.RLock()
+        self._writer_conn = None
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a new connection and apply the pool PRAGMAs"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.CACHED_STATEMENTS,
+        )
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        self.ensure_schema(conn)
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def ensure_schema(self, conn: sqlite3.Connection):
+        """Run SCHEMA_STATEMENTS the first time any connection is set up"""
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            for statement in self.SCHEMA_STATEMENTS:
+                conn.execute(statement)
+            conn.commit()
+            self._schema_ready = True
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a reader connection, opening a new one while under the limit"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_count_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self._connect(read_only=True)
+            except Exception:
+                with self._reader_count_lock:
+                    self._reader_count -= 1
+                raise
+
+        return self._readers.get(timeout=self.timeout)
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a reader connection to the pool"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._readers.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a reader connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def writer(self):
+        """
+        Hold the shared writer connection for the duration of a with-block.
+
+        Like sqlite3.Connection used as a context manager, pending changes are
+        committed on normal exit and rolled back if an exception escapes.
+        """
+        with self._writer_lock:
+            if self._writer_conn is None:
+                self._writer_conn = self._connect()
+            conn = self._writer_conn
+            try:
+                yield conn
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            else:
+                if conn.in_transaction:
+                    conn.commit()
+
+    def run_maintenance(self, pages: int = 1000):
+        """
+        Reclaim up to `pages` free pages and refresh query planner statistics.
+
+        Runs through executescript because a plain execute() only steps
+        PRAGMA incremental_vacuum once, which frees a single page.
+        """
+        with self.writer() as conn:
+            conn.executescript(f"PRAGMA incremental_vacuum({int(pages)}); PRAGMA optimize;")
+
+    def optimize(self):
+        """Refresh query planner statistics for tables whose contents drifted"""
+        with self.writer() as conn:
+            conn.execute("PRAGMA optimize")
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._writer_lock:
+            if self._writer_conn is not None:
+                try:
+                    self._writer_conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logger.warning(f"PRAGMA optimize failed on close: {e}")
+                self._writer_conn.close()
+                self._writer_conn = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._reader_count_lock:
+            self._reader_count = 0
+
 class DatabaseConnection:
     """Database connection manager supporting both SQLite and PostgreSQL"""
     
@@ -186,6 +367,68 @@ def get_db_connection():
     """Get the global database connection instance"""
     return db_connection
 
+# Shared SQLite connection pool, created on first use
+_sqlite_pool = None
+_sqlite_pool_lock = threading.Lock()
+
+def get_sqlite_pool() -> SQLiteConnectionPool:
+    """Get the process-wide SQLite connection pool for DB_PATH"""
+    global _sqlite_pool
+    if _sqlite_pool is None:
+        with _sqlite_pool_lock:
+            if _sqlite_pool is None:
+                _sqlite_pool = SQLiteConnectionPool(DB_PATH)
+                # close() runs PRAGMA optimize, so planner stats are saved
+                # even when the bot exits without a clean shutdown
+                atexit.register(_sqlite_pool.close)
+    return _sqlite_pool
+
+# Background incremental vacuum, started by start_db_maintenance()
+_maintenance_stop = threading.Event()
+_maintenance_thread = None
+
+# PRAGMA optimize is cheap, so run it more often than the full maintenance
+PLANNER_OPTIMIZE_INTERVAL_HOURS = 6
+
+def start_db_maintenance(interval_hours: int = DB_MAINTENANCE_INTERVAL_HOURS):
+    """
+    Periodically reclaim free pages left behind by deletions and run
+    PRAGMA optimize, instead of ever running a full blocking VACUUM.
+    """
+    global _maintenance_thread
+    if db_connection.use_postgresql:
+        return
+    if _maintenance_thread is not None and _maintenance_thread.is_alive():
+        logger.info("Database maintenance is already running")
+        return
+
+    step_hours = min(interval_hours, PLANNER_OPTIMIZE_INTERVAL_HOURS)
+
+    def maintenance_loop():
+        hours_since_maintenance = 0
+        while not _maintenance_stop.wait(step_hours * 3600):
+            hours_since_maintenance += step_hours
+            try:
+                if hours_since_maintenance >= interval_hours:
+                    hours_since_maintenance = 0
+                    get_sqlite_pool().run_maintenance()
+                    logger.info("Database maintenance completed")
+                else:
+                    get_sqlite_pool().optimize()
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}")
+
+    _maintenance_stop.clear()
+    _maintenance_thread = threading.Thread(target=maintenance_loop, daemon=True)
+    _maintenance_thread.start()
+    logger.info(f"Database maintenance started - running every {interval_hours} hours")
+
+def stop_db_maintenance():
+    """Stop the maintenance thread and close the SQLite pool"""
+    _maintenance_stop.set()
+    if _sqlite_pool is not None:
+        _sqlite_pool.close()
+
 # Convenience functions for backward compatibility
 def get_db():
     """Get database connection (backward compatibility)"""
@@ -5,7 +5,7 @@ Database migration system for the confession bot
 import sqlite3
 import os
 from datetime import datetime
-from typing import List, Callable
+from typing import List, Callable, Sequence
 import hashlib
 
 from config import DB_PATH
@@ -14,14 +14,33 @@ from logger import get_logger
 logger = get_logger('migrations')
 
 
+def split_sql_statements(sql: str) -> List[str]:
+    """Split a SQL script on semicolons, keeping trigger BEGIN ... END bodies intact"""
+    statements = []
+    buffer = ""
+    for piece in sql.split(';'):
+        buffer += piece + ';'
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip().rstrip(';').strip()
+            if statement:
+                statements.append(statement)
+            buffer = ""
+    if buffer.strip().rstrip(';').strip():
+        statements.append(buffer.strip().rstrip(';').strip())
+    return statements
+
+
 class Migration:
     """Represents a single database migration"""
     
-    def __init__(self, version: int, name: str, up_sql: str, down_sql: str = ""):
+    def __init__(self, version: int, name: str, up_sql: str, down_sql: str = "",
+                 requires_tables: Sequence[str] = ()):
         self.version = version
         self.name = name
         self.up_sql = up_sql
         self.down_sql = down_sql
+        # Tables that must exist for up_sql to run; without them the migration is a no-op
+        self.requires_tables = tuple(requires_tables)
         self.checksum = hashlib.md5((up_sql + down_sql).encode()).hexdigest()
 
 
@@ -434,6 +453,309 @@ class MigrationManager:
                 -- This would revert back to NOT NULL constraint
                 -- Not recommended as it could break existing media-only posts
                 """
+            ),
+
+            # Version 16: Cascade post/comment deletes to dependent rows
+            # reactions/reports are polymorphic (target_type, target_id) so they
+            # cannot carry a real FOREIGN KEY; BEFORE DELETE triggers clear the
+            # children so a single DELETE on the parent does the whole cascade.
+            Migration(
+                version=16,
+                name="add_delete_cascade_triggers",
+                up_sql="""
+                CREATE TRIGGER IF NOT EXISTS trg_posts_delete_cascade
+                BEFORE DELETE ON posts
+                BEGIN
+                    DELETE FROM comments WHERE post_id = OLD.post_id;
+                    DELETE FROM reports WHERE target_type = 'post' AND target_id = OLD.post_id;
+                    DELETE FROM reactions WHERE target_type = 'post' AND target_id = OLD.post_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_comments_delete_cascade
+                BEFORE DELETE ON comments
+                BEGIN
+                    DELETE FROM reactions WHERE target_type = 'comment' AND (
+                        target_id = OLD.comment_id
+                        OR target_id IN (SELECT comment_id FROM comments WHERE parent_comment_id = OLD.comment_id)
+                    );
+                    DELETE FROM reports WHERE target_type = 'comment' AND (
+                        target_id = OLD.comment_id
+                        OR target_id IN (SELECT comment_id FROM comments WHERE parent_comment_id = OLD.comment_id)
+                    );
+                    DELETE FROM comments WHERE parent_comment_id = OLD.comment_id;
+                END;
+                """,
+                down_sql="""
+                DROP TRIGGER IF EXISTS trg_comments_delete_cascade;
+                DROP TRIGGER IF EXISTS trg_posts_delete_cascade;
+                """
+            ),
+
+            # Version 17: Full-text search over post and comment content
+            # External-content FTS5 tables index posts/comments without storing a
+            # second copy of the text; triggers keep them in sync.
+            Migration(
+                version=17,
+                name="add_content_fts",
+                up_sql="""
+                CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                    content, content='posts', content_rowid='post_id', tokenize='porter unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS trg_posts_fts_insert
+                AFTER INSERT ON posts
+                BEGIN
+                    INSERT INTO posts_fts(rowid, content) VALUES (NEW.post_id, NEW.content);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_posts_fts_delete
+                AFTER DELETE ON posts
+                BEGIN
+                    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', OLD.post_id, OLD.content);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_posts_fts_update
+                AFTER UPDATE OF content ON posts
+                BEGIN
+                    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', OLD.post_id, OLD.content);
+                    INSERT INTO posts_fts(rowid, content) VALUES (NEW.post_id, NEW.content);
+                END;
+
+                INSERT INTO posts_fts(posts_fts) VALUES ('rebuild');
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+                    content, content='comments', content_rowid='comment_id', tokenize='porter unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS trg_comments_fts_insert
+                AFTER INSERT ON comments
+                BEGIN
+                    INSERT INTO comments_fts(rowid, content) VALUES (NEW.comment_id, NEW.content);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_comments_fts_delete
+                AFTER DELETE ON comments
+                BEGIN
+                    INSERT INTO comments_fts(comments_fts, rowid, content) VALUES ('delete', OLD.comment_id, OLD.content);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_comments_fts_update
+                AFTER UPDATE OF content ON comments
+                BEGIN
+                    INSERT INTO comments_fts(comments_fts, rowid, content) VALUES ('delete', OLD.comment_id, OLD.content);
+                    INSERT INTO comments_fts(rowid, content) VALUES (NEW.comment_id, NEW.content);
+                END;
+
+                INSERT INTO comments_fts(comments_fts) VALUES ('rebuild');
+                """,
+                down_sql="""
+                DROP TRIGGER IF EXISTS trg_comments_fts_update;
+                DROP TRIGGER IF EXISTS trg_comments_fts_delete;
+                DROP TRIGGER IF EXISTS trg_comments_fts_insert;
+                DROP TABLE IF EXISTS comments_fts;
+                DROP TRIGGER IF EXISTS trg_posts_fts_update;
+                DROP TRIGGER IF EXISTS trg_posts_fts_delete;
+                DROP TRIGGER IF EXISTS trg_posts_fts_insert;
+                DROP TABLE IF EXISTS posts_fts;
+                """
+            ),
+
+            # Version 18: Timestamp indexes for date-range filters
+            Migration(
+                version=18,
+                name="add_timestamp_range_indexes",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_comments_timestamp ON comments(timestamp);
+                """,
+                down_sql="""
+                DROP INDEX IF EXISTS idx_comments_timestamp;
+                DROP INDEX IF EXISTS idx_posts_timestamp;
+                """
+            ),
+            
+            # Version 19: Indexes for status-filtered, newest-first post listings
+            Migration(
+                version=19,
+                name="add_post_status_timestamp_indexes",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_posts_status_ts ON posts(status, timestamp);
+                -- Pending posts are stored as 'pending' or NULL; the predicate matches
+                -- the queries' filter so the planner can pick this partial index
+                CREATE INDEX IF NOT EXISTS idx_posts_pending ON posts(timestamp)
+                    WHERE status = 'pending' OR status IS NULL;
+                """,
+                down_sql="""
+                DROP INDEX IF EXISTS idx_posts_pending;
+                DROP INDEX IF EXISTS idx_posts_status_ts;
+                """
+            ),
+            
+            # Version 20: Covering index for per-target reaction counts by type
+            Migration(
+                version=20,
+                name="add_reactions_target_type_index",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_reactions_target_type ON reactions(target_type, target_id, reaction_type);
+                DROP INDEX IF EXISTS idx_reactions_target;
+                """,
+                down_sql="""
+                CREATE INDEX IF NOT EXISTS idx_reactions_target ON reactions(target_type, target_id);
+                DROP INDEX IF EXISTS idx_reactions_target_type;
+                """
+            ),
+            
+            # Version 21: Newest-first post listings per user
+            Migration(
+                version=21,
+                name="add_posts_user_timestamp_index",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_posts_user_timestamp ON posts(user_id, timestamp);
+                DROP INDEX IF EXISTS idx_posts_user_id;
+                """,
+                down_sql="""
+                CREATE INDEX IF NOT EXISTS idx_posts_user_id ON posts(user_id);
+                DROP INDEX IF EXISTS idx_posts_user_timestamp;
+                """
+            ),
+            
+            # Version 22: Newest-first comment listings per user
+            Migration(
+                version=22,
+                name="add_comments_user_timestamp_index",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_comments_user_timestamp ON comments(user_id, timestamp);
+                DROP INDEX IF EXISTS idx_comments_user_id;
+                """,
+                down_sql="""
+                CREATE INDEX IF NOT EXISTS idx_comments_user_id ON comments(user_id);
+                DROP INDEX IF EXISTS idx_comments_user_timestamp;
+                """
+            ),
+            Migration(
+                version=23,
+                name="add_post_number_counter",
+                up_sql="""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                );
+                INSERT OR IGNORE INTO counters (name, value)
+                SELECT 'post_number', COALESCE(MAX(post_number), 0) FROM posts;
+                """,
+                down_sql="""
+                DROP TABLE IF EXISTS counters;
+                """
+            ),
+            Migration(
+                version=24,
+                name="add_post_number_index",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_posts_post_number ON posts(post_number) WHERE post_number IS NOT NULL;
+                """,
+                down_sql="""
+                DROP INDEX IF EXISTS idx_posts_post_number;
+                """
+            ),
+
+            # Version 25: Keep comment like/dislike counters in step with reactions
+            # so reacting is a single write on reactions
+            Migration(
+                version=25,
+                name="add_comment_reaction_count_triggers",
+                up_sql="""
+                CREATE TRIGGER IF NOT EXISTS trg_reactions_comment_insert
+                AFTER INSERT ON reactions
+                WHEN NEW.target_type = 'comment'
+                BEGIN
+                    UPDATE comments SET
+                        likes = likes + (NEW.reaction_type = 'like'),
+                        dislikes = dislikes + (NEW.reaction_type != 'like')
+                    WHERE comment_id = NEW.target_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_reactions_comment_update
+                AFTER UPDATE OF reaction_type ON reactions
+                WHEN NEW.target_type = 'comment' AND NEW.reaction_type != OLD.reaction_type
+                BEGIN
+                    UPDATE comments SET
+                        likes = likes + (NEW.reaction_type = 'like') - (OLD.reaction_type = 'like'),
+                        dislikes = dislikes + (NEW.reaction_type != 'like') - (OLD.reaction_type != 'like')
+                    WHERE comment_id = NEW.target_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_reactions_comment_delete
+                AFTER DELETE ON reactions
+                WHEN OLD.target_type = 'comment'
+                BEGIN
+                    UPDATE comments SET
+                        likes = likes - (OLD.reaction_type = 'like'),
+                        dislikes = dislikes - (OLD.reaction_type != 'like')
+                    WHERE comment_id = OLD.target_id;
+                END;
+                """,
+                down_sql="""
+                DROP TRIGGER IF EXISTS trg_reactions_comment_delete;
+                DROP TRIGGER IF EXISTS trg_reactions_comment_update;
+                DROP TRIGGER IF EXISTS trg_reactions_comment_insert;
+                """
+            ),
+
+            # Version 26: Widen the comments (post_id, timestamp) index so it also
+            # covers the parent/comment_id filters used to locate a comment's page
+            Migration(
+                version=26,
+                name="add_comments_post_timestamp_covering_index",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_comments_post_ts_parent ON comments(post_id, timestamp, parent_comment_id, comment_id);
+                DROP INDEX IF EXISTS idx_comments_post_id_timestamp;
+                """,
+                down_sql="""
+                CREATE INDEX IF NOT EXISTS idx_comments_post_id_timestamp ON comments(post_id, timestamp);
+                DROP INDEX IF EXISTS idx_comments_post_ts_parent;
+                """
+            ),
+
+            # Version 27: Keep a per-post comment counter up to date with triggers
+            Migration(
+                version=27,
+                name="add_post_comment_count",
+                up_sql="""
+                ALTER TABLE posts ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0;
+                UPDATE posts SET comment_count = (
+                    SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.post_id
+                );
+
+                CREATE TRIGGER IF NOT EXISTS trg_comments_count_insert
+                AFTER INSERT ON comments
+                BEGIN
+                    UPDATE posts SET comment_count = comment_count + 1 WHERE post_id = NEW.post_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_comments_count_delete
+                AFTER DELETE ON comments
+                BEGIN
+                    UPDATE posts SET comment_count = comment_count - 1 WHERE post_id = OLD.post_id;
+                END;
+                """,
+                down_sql="""
+                DROP TRIGGER IF EXISTS trg_comments_count_delete;
+                DROP TRIGGER IF EXISTS trg_comments_count_insert;
+                """
+            ),
+
+            # Version 28: Index for the read-notification cleanup date range. Only
+            # databases that have the notifications table get it
+            Migration(
+                version=28,
+                name="add_notifications_read_created_index",
+                up_sql="""
+                CREATE INDEX IF NOT EXISTS idx_notifications_read_created ON notifications(read, created_at);
+                """,
+                down_sql="""
+                DROP INDEX IF EXISTS idx_notifications_read_created;
+                """,
+                requires_tables=("notifications",)
             )
         ]
     
@@ -467,10 +789,19 @@ class MigrationManager:
                 # Apply the migration
                 logger.info(f"Applying migration {migration.version}: {migration.name}")
                 
+                missing_tables = [
+                    table for table in migration.requires_tables
+                    if not cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                    ).fetchone()
+                ]
+                if missing_tables:
+                    logger.warning(f"Migration {migration.version}: missing tables {', '.join(missing_tables)}, nothing to apply")
+                
                 # Execute the up SQL
-                if migration.up_sql.strip():
+                if migration.up_sql.strip() and not missing_tables:
                     # Split by semicolon and execute each statement
-                    statements = [stmt.strip() for stmt in migration.up_sql.split(';') if stmt.strip()]
+                    statements = split_sql_statements(migration.up_sql)
                     for statement in statements:
                         try:
                             cursor.execute(statement)
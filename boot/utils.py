@@ -1,5 +1,6 @@
 import re
 import unicodedata
+from functools import lru_cache
 from config import SPAM_WORDS
 
 def contains_meaningful_content(text):
@@ -63,18 +64,17 @@ def is_spam(text):
     
     return False
 
+# Characters that need escaping in MarkdownV2, mapped to their escaped form.
+# str.translate escapes them all in a single pass, so backslashes it inserts
+# are never escaped again.
+_MARKDOWN_V2_ESCAPES = str.maketrans({char: f'\\{char}' for char in '\\_*[]()~`>#+-=|{}.!'})
+
 def escape_markdown_text(text):
     """Escape text for MarkdownV2"""
     if not text:
         return ""
     # Convert to string if it's not already a string
-    text = str(text)
-    # List of characters that need escaping in MarkdownV2
-    # Note: order matters for some characters
-    escape_chars = ['\\', '_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    for char in escape_chars:
-        text = text.replace(char, f'\\{char}')
-    return text
+    return str(text).translate(_MARKDOWN_V2_ESCAPES)
 
 def escape_html_text(text):
     """Escape text for HTML parse mode"""
@@ -145,6 +145,15 @@ def format_hashtags(hashtags):
         hashtags = hashtags.split(',') if hashtags else []
     return " ".join([f"#{tag.strip()}" for tag in hashtags if tag.strip()])
 
+_REMOVE_SPACES = str.maketrans('', '', ' ')
+
+@lru_cache(maxsize=1024)
+def categories_to_hashtags(categories):
+    """Turn a comma-separated category string into channel hashtags"""
+    return " ".join(
+        f"#{cat.strip().translate(_REMOVE_SPACES)}" for cat in categories.split(",")
+    )
+
 def escape_hashtags(text):
     """Escape hashtags in text for MarkdownV2"""
     if not text:
@@ -185,9 +194,13 @@ def format_time_ago(dt):
     now = datetime.now(timezone.utc)
     diff = now - dt
     
-    days = diff.days
-    hours = diff.seconds // 3600
-    minutes = (diff.seconds // 60) % 60
+    return format_seconds_ago(diff.days * 86400 + diff.seconds)
+
+def format_seconds_ago(seconds):
+    """Format an age in whole seconds like format_time_ago, without datetime math"""
+    days, remainder = divmod(seconds, 86400)
+    hours = remainder // 3600
+    minutes = (remainder // 60) % 60
     
     if days > 0:
         if days == 1: